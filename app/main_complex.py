@@ -36,6 +36,9 @@ from api.middleware.error_handling import (
 # Router imports
 from api.routes import lti, canvas, qa_tasks, websockets, health
 
+# QA framework imports
+from qa_framework.base import configure_event_loop
+
 # Get settings instance
 settings = get_settings()
 
@@ -231,6 +234,10 @@ async def startup_event():
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Base URL: {settings.base_url}")
     
+    # Let non-blocking progress callbacks complete without extra loop turns
+    if configure_event_loop():
+        logger.info("Eager task factory enabled for QA progress dispatch")
+    
     # Validate configuration using new multi-instance structure
     try:
         canvas_config = settings.get_canvas_instance_config()
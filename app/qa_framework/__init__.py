@@ -74,6 +74,7 @@ from .base import (
     QAExecutionEngine,
     RateLimiter,
     get_execution_engine,
+    configure_event_loop,
     
     # Exceptions
     QATaskError,
@@ -141,6 +142,7 @@ __all__ = [
     "QAExecutionEngine",
     "RateLimiter",
     "get_execution_engine",
+    "configure_event_loop",
     
     # Progress and error handling
     "ProgressBroadcaster",
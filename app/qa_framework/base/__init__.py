@@ -51,7 +51,8 @@ from .task_registry import (
 from .execution_engine import (
     QAExecutionEngine,
     RateLimiter,
-    get_execution_engine
+    get_execution_engine,
+    configure_event_loop
 )
 
 __all__ = [
@@ -93,6 +94,7 @@ __all__ = [
     "QAExecutionEngine",
     "RateLimiter",
     "get_execution_engine",
+    "configure_event_loop",
     
     # Exceptions
     "QATaskError",
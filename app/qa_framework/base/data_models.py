@@ -5,13 +5,14 @@ This module defines the core data structures for the QA automation framework,
 providing standardized interfaces for task configuration, results, and metadata.
 """
 
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 
 class TaskStatus(str, Enum):
@@ -91,6 +92,7 @@ class FindReplaceConfig(TaskConfig):
     case_sensitive: bool = Field(default=False)
     whole_word_only: bool = Field(default=False)
     include_html_attributes: bool = Field(default=True)
+    max_concurrent_content_types: int = Field(default=4, ge=1, le=8)
     
     @validator('url_mappings')
     def validate_url_mappings(cls, v):
@@ -272,6 +274,10 @@ class QAExecution(BaseModel):
     canvas_context: Dict[str, Any] = Field(default_factory=dict)
     lti_context: Dict[str, Any] = Field(default_factory=dict)
     
+    # Cached 100/total for percentage calculation (total rarely changes between ticks)
+    _progress_total: Optional[int] = PrivateAttr(default=None)
+    _inv_total: Optional[float] = PrivateAttr(default=None)
+    
     class Config:
         use_enum_values = True
     
@@ -279,12 +285,17 @@ class QAExecution(BaseModel):
         """Update task progress"""
         self.current_stage = stage
         
+        # Refresh the cached reciprocal only when the total changes
+        if total != self._progress_total:
+            self._progress_total = total
+            self._inv_total = 100.0 / total if total > 0 else None
+        
         progress = ProgressUpdate(
             task_id=self.task_id,
             stage=stage,
             current=current,
             total=total,
-            percentage=round((current / total * 100) if total > 0 else 0.0, 2),
+            percentage=round(current * self._inv_total, 2) if self._inv_total else 0.0,
             message=message
         )
         
@@ -318,6 +329,12 @@ class QAExecution(BaseModel):
         )
 
 
+# Intern enum values so status/stage keys compare by identity in counters and lookups
+for _member in (*TaskStatus, *ProgressStage, *QATaskType, *CanvasContentType):
+    sys.intern(_member.value)
+del _member
+
+
 # Type aliases for convenience
 QATaskConfig = Union[TaskConfig, FindReplaceConfig]
 ConfigDict = Dict[str, Any] 
\ No newline at end of file
@@ -8,6 +8,7 @@ handling background processing, Canvas API rate limiting, and session persistenc
 import asyncio
 import logging
 import time
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Callable, Set
 from uuid import uuid4
@@ -401,22 +402,51 @@ class QAExecutionEngine:
     def get_engine_stats(self) -> Dict[str, Any]:
         """Get execution engine statistics"""
         active_count = len(self._active_executions)
-        status_counts = {}
-        
-        for execution in self._active_executions.values():
-            status = execution.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = Counter(
+            TaskStatus(execution.status).value
+            for execution in self._active_executions.values()
+        )
         
         rate_limit_info = self._rate_limiter.get_remaining_calls()
         
         return {
             'active_executions': active_count,
-            'status_breakdown': status_counts,
+            'status_breakdown': dict(status_counts),
             'rate_limit_remaining': rate_limit_info,
             'cancellation_tokens': len(self._cancellation_tokens)
         }
 
 
+def configure_event_loop(loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+    """
+    Install the eager task factory on the event loop.
+    
+    Eager tasks run synchronously until they first suspend, so progress
+    callbacks that never block finish without being scheduled on the loop.
+    Requires Python 3.12+; on older interpreters this is a no-op.
+    
+    Args:
+        loop: Event loop to configure (defaults to the running loop)
+        
+    Returns:
+        True if the eager task factory is in use, False otherwise
+    """
+    eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+    if eager_task_factory is None:
+        logger.debug("Eager task factory unavailable - using default task factory")
+        return False
+    
+    loop = loop or asyncio.get_running_loop()
+    
+    # Don't clobber a task factory installed by someone else
+    current_factory = loop.get_task_factory()
+    if current_factory is None:
+        loop.set_task_factory(eager_task_factory)
+        return True
+    
+    return current_factory is eager_task_factory
+
+
 # Global execution engine instance
 _global_engine = QAExecutionEngine()
 
@@ -5,8 +5,13 @@ This module defines the abstract base class that all QA automation tasks must in
 ensuring a consistent interface for task registration, execution, and result handling.
 """
 
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from .data_models import (
     QATaskConfig, 
@@ -16,9 +21,12 @@ from .data_models import (
     ProgressUpdate,
     QAExecution,
     TaskStatus,
-    ProgressStage
+    ProgressStage,
+    CanvasContentType
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ProgressTracker:
     """
@@ -28,14 +36,77 @@ class ProgressTracker:
     including WebSocket/SSE integration for frontend updates.
     """
     
+    # One tracker per execution - slots keep instances small and attribute access cheap
+    __slots__ = (
+        'task_id',
+        'execution',
+        '_callbacks',
+        '_has_callbacks',
+        '_sync_callbacks',
+        '_async_callbacks',
+        '_fire_and_forget_callbacks',
+        '_pending',
+        '_max_pending',
+        '_min_interval_s',
+        '_last_emit',
+        '_last_emitted_stage',
+        '_scheduled',
+        '_flush_handle',
+        '_flush_task',
+    )
+    
     def __init__(self, task_id: str, execution: QAExecution):
         self.task_id = task_id
         self.execution = execution
-        self._callbacks: List[callable] = []
+        # Callback collections are immutable tuples, rebound on add, so iteration in
+        # update_progress always sees a consistent snapshot
+        self._callbacks: Tuple[callable, ...] = ()
+        
+        # Callbacks split by kind at registration so the hot path never re-inspects them
+        self._has_callbacks = False
+        self._sync_callbacks: Tuple[callable, ...] = ()
+        self._async_callbacks: Tuple[callable, ...] = ()
+        self._fire_and_forget_callbacks: Tuple[callable, ...] = ()
+        
+        # In-flight fire-and-forget deliveries (kept referenced so they aren't GC'd)
+        self._pending: Set[asyncio.Task] = set()
+        self._max_pending = 100
+        
+        # Throttle: emit at most one update per interval (final and stage-change
+        # updates always go out); intermediate updates are coalesced away
+        self._min_interval_s = 0.05
+        self._last_emit = 0.0
+        self._last_emitted_stage: Optional[ProgressStage] = None
+        
+        # Latest update queued by schedule_progress, the timer that will send it,
+        # and the delivery the timer last started
+        self._scheduled: Optional[Tuple[ProgressStage, int, int, str]] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
     
-    def add_callback(self, callback: callable):
-        """Add a progress update callback"""
-        self._callbacks.append(callback)
+    def add_callback(self, callback: callable, fire_and_forget: bool = False):
+        """
+        Add a progress update callback.
+        
+        Args:
+            callback: Sync or async callable receiving each ProgressUpdate
+            fire_and_forget: Dispatch async callbacks as background tasks instead
+                of awaiting them, so a slow subscriber can't stall progress updates
+            
+        Raises:
+            TypeError: If callback is not callable
+        """
+        if not callable(callback):
+            raise TypeError(f"Progress callback must be callable, got {type(callback).__name__}")
+        
+        self._callbacks = self._callbacks + (callback,)
+        if not asyncio.iscoroutinefunction(callback):
+            self._sync_callbacks = self._sync_callbacks + (callback,)
+        elif fire_and_forget:
+            self._fire_and_forget_callbacks = self._fire_and_forget_callbacks + (callback,)
+        else:
+            self._async_callbacks = self._async_callbacks + (callback,)
+        self._has_callbacks = True
     
     async def update_progress(
         self, 
@@ -53,38 +124,147 @@ class ProgressTracker:
             current: Current item count
             total: Total item count  
             message: Human-readable progress message
-            **kwargs: Additional progress data
+            **kwargs: Additional progress data (ProgressUpdate fields)
             
         Returns:
             ProgressUpdate object with current status
+            
+        Raises:
+            ValidationError: If an extra isn't a ProgressUpdate field or fails validation
         """
         progress = self.execution.update_progress(stage, current, total, message)
         
-        # Add any additional data
-        for key, value in kwargs.items():
-            setattr(progress, key, value)
+        # Add any additional data, validated like constructor arguments (unknown
+        # fields raise); most callers pass no extras at all
+        if kwargs:
+            validate_assignment = progress.__pydantic_validator__.validate_assignment
+            for key, value in kwargs.items():
+                validate_assignment(progress, key, value)
+        
+        # Fast path: nothing to notify
+        if not self._has_callbacks:
+            return progress
+        
+        now = time.monotonic()
+        if (
+            current < total
+            and stage == self._last_emitted_stage
+            and now - self._last_emit < self._min_interval_s
+        ):
+            return progress
+        self._last_emit = now
+        self._last_emitted_stage = stage
         
         # Notify all callbacks (for WebSocket/SSE updates)
-        for callback in self._callbacks:
+        for callback in self._sync_callbacks:
             try:
-                if hasattr(callback, '__call__'):
-                    await callback(progress)
+                outcome = callback(progress)
+                # Wrapped coroutine functions (e.g. partials) still need awaiting
+                if asyncio.iscoroutine(outcome):
+                    await outcome
             except Exception as e:
                 # Log callback errors but don't fail the task
-                import logging
-                logging.error(f"Progress callback error: {e}")
+                logger.error(f"Progress callback error: {e}")
+        
+        for callback in self._fire_and_forget_callbacks:
+            if len(self._pending) >= self._max_pending:
+                # Subscribers are falling behind - apply backpressure instead of growing unbounded
+                await self._run_callback(callback, progress)
+                continue
+            task = asyncio.get_running_loop().create_task(self._run_callback(callback, progress))
+            if not task.done():
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+        
+        if len(self._async_callbacks) == 1:
+            await self._run_callback(self._async_callbacks[0], progress)
+        elif self._async_callbacks:
+            # With the eager task factory installed, callbacks that never block
+            # complete inside create_task without an extra event-loop turn
+            async with asyncio.TaskGroup() as task_group:
+                for callback in self._async_callbacks:
+                    task_group.create_task(self._run_callback(callback, progress))
         
         return progress
     
+    def schedule_progress(self, stage: ProgressStage, current: int, total: int, message: str = ""):
+        """
+        Queue a progress update without waiting for it to be delivered.
+        
+        For tight loops: updates are coalesced and the latest one is sent at most
+        one throttle interval later. Await flush_progress() once the loop is done
+        so the final update is delivered in order. Requires a running event loop.
+        
+        Args:
+            stage: Current execution stage
+            current: Current item count
+            total: Total item count
+            message: Human-readable progress message
+        """
+        self._scheduled = (stage, current, total, message)
+        
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._min_interval_s, self._flush_scheduled
+            )
+    
+    async def flush_progress(self):
+        """
+        Send the most recently scheduled progress update and wait for delivery.
+        
+        Any timer-driven delivery still in flight is awaited first, so the
+        flushed update always lands after it.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        if self._flush_task is not None:
+            await self._flush_task
+        
+        if self._scheduled is None:
+            return
+        
+        stage, current, total, message = self._scheduled
+        self._scheduled = None
+        await self.update_progress(stage, current, total, message)
+    
+    def _flush_scheduled(self):
+        """Send the most recently scheduled progress update (timer callback)"""
+        self._flush_handle = None
+        if self._scheduled is None:
+            return
+        
+        stage, current, total, message = self._scheduled
+        self._scheduled = None
+        
+        task = asyncio.get_running_loop().create_task(self.update_progress(stage, current, total, message))
+        if not task.done():
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            self._flush_task = task
+            task.add_done_callback(self._forget_flush_task)
+    
+    def _forget_flush_task(self, task: asyncio.Task):
+        """Drop the reference to a finished timer-driven delivery"""
+        if self._flush_task is task:
+            self._flush_task = None
+    
+    async def _run_callback(self, callback: callable, progress: ProgressUpdate):
+        """Run an async callback, logging failures instead of propagating them"""
+        try:
+            await callback(progress)
+        except Exception as e:
+            logger.error(f"Progress callback error: {e}")
+    
     async def update_status(self, status: TaskStatus, message: str = ""):
         """Update task status"""
         self.execution.status = status
         # Could trigger status-specific callbacks here
     
-    async def log_error(self, error: Exception, context: Dict[str, Any] = None):
-        """Log an error during task execution"""
-        import logging
-        logging.error(f"QA Task {self.task_id} error: {error}", extra=context or {})
+    def log_error(self, error: Exception, context: Dict[str, Any] = None):
+        """Log an error during task execution (synchronous - nothing here awaits)"""
+        logger.error(f"QA Task {self.task_id} error: {error}", extra=context or {})
     
     async def complete_task(self, result: QAResult):
         """Mark task as completed with final results"""
@@ -99,6 +279,10 @@ class QATask(ABC):
     This ensures a consistent interface for task registration, execution, and result handling.
     """
     
+    def __init__(self):
+        # Lazily populated by _load_task_info() for the metadata helpers below
+        self._task_info_cache: Optional[TaskInfo] = None
+    
     @abstractmethod
     async def execute(
         self, 
@@ -129,6 +313,9 @@ class QATask(ABC):
         """
         Get metadata and information about this QA task.
         
+        May be implemented as a classmethod, which lets the registry read task
+        metadata without constructing an instance.
+        
         Returns:
             TaskInfo containing task name, description, version, requirements, etc.
         """
@@ -215,7 +402,7 @@ class QATask(ABC):
             config: Task configuration
             progress_tracker: Progress tracker for error reporting
         """
-        await progress_tracker.log_error(error, {
+        progress_tracker.log_error(error, {
             'task_type': config.task_type,
             'task_id': config.task_id,
             'course_id': config.course_id
@@ -247,8 +434,6 @@ class QATask(ABC):
         Returns:
             QAResult with basic fields set
         """
-        from datetime import datetime
-        
         return QAResult(
             task_id=config.task_id,
             task_type=config.task_type,
@@ -263,8 +448,7 @@ class QATask(ABC):
         Returns:
             List of Canvas permission strings
         """
-        task_info = self.get_task_info()
-        return task_info.required_canvas_permissions
+        return self._load_task_info().required_canvas_permissions
     
     def supports_content_types(self) -> List[str]:
         """
@@ -273,30 +457,49 @@ class QATask(ABC):
         Returns:
             List of Canvas content type strings
         """
-        task_info = self.get_task_info()
-        return [ct.value for ct in task_info.supported_content_types]
+        task_info = self._load_task_info()
+        return [CanvasContentType(ct).value for ct in task_info.supported_content_types]
+    
+    @cached_property
+    def _supported_types_set(self) -> FrozenSet[str]:
+        """Supported content type values as a frozenset, for O(1) membership checks"""
+        return frozenset(self.supports_content_types())
     
     def get_display_name(self) -> str:
         """Get human-readable task name"""
-        return self.get_task_info().name
+        return self._load_task_info().name
     
     def get_description(self) -> str:
         """Get task description"""
-        return self.get_task_info().description
+        return self._load_task_info().description
     
     def get_version(self) -> str:
         """Get task version"""
-        return self.get_task_info().version
+        return self._load_task_info().version
+    
+    def _load_task_info(self) -> TaskInfo:
+        """Get task info, building it via get_task_info() only on first use"""
+        task_info = getattr(self, '_task_info_cache', None)
+        if task_info is None:
+            task_info = self._task_info_cache = self.get_task_info()
+        return task_info
 
 
 # Base exception for QA task errors
 class QATaskError(Exception):
     """Base exception for QA task execution errors"""
     
+    # BaseException still provides __dict__; the slots just make these fields slot-backed
+    __slots__ = ('task_id', 'details')
+    
     def __init__(self, message: str, task_id: str = None, details: Dict[str, Any] = None):
         super().__init__(message)
         self.task_id = task_id
         self.details = details or {}
+    
+    def __reduce__(self):
+        # Slot values aren't part of BaseException's pickled state
+        return (type(self), (*self.args, self.task_id, self.details))
 
 
 class QATaskConfigError(QATaskError):
@@ -10,15 +10,23 @@ import inspect
 import logging
 import os
 import pkgutil
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
 from functools import wraps
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type, Set
 
+from packaging.version import InvalidVersion, Version
+
 from .qa_task import QATask, QATaskError
-from .data_models import TaskInfo, QATaskType, ValidationResult
+from .data_models import TaskInfo, QATaskType, CanvasContentType, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# Methods every registered task class must provide
+_REQUIRED_TASK_METHODS = ('execute', 'get_task_info', 'validate_config', 'get_config_schema')
+
 
 class QATaskRegistry:
     """
@@ -32,6 +40,18 @@ class QATaskRegistry:
         self._task_info: Dict[str, TaskInfo] = {}
         self._task_metadata: Dict[str, Dict[str, Any]] = {}
         self._registered_modules: Set[str] = set()
+        self._tasks_by_type: Dict[QATaskType, List[str]] = {}
+        
+        # Running histograms for get_registry_stats
+        self._type_counts: Dict[str, int] = defaultdict(int)
+        self._version_counts: Dict[str, int] = defaultdict(int)
+        
+        # Source mtimes of discovered modules, used to skip unchanged modules
+        self._module_mtimes: Dict[str, Optional[int]] = {}
+        
+        # Secondary indexes so package-scoped operations avoid prefix scans
+        self._tasks_by_module: Dict[str, Set[str]] = defaultdict(set)
+        self._modules_by_package: Dict[str, Set[str]] = defaultdict(set)
     
     def register_task(
         self, 
@@ -57,54 +77,125 @@ class QATaskRegistry:
             True if registration successful, False otherwise
         """
         try:
-            # Validate task class
-            if not issubclass(task_class, QATask):
-                logger.error(f"Task class {task_class.__name__} must inherit from QATask")
+            registration = self._prepare_registration(
+                task_class, name, description, version, canvas_permissions, **metadata
+            )
+            if registration is None:
                 return False
             
-            # Get task info from the class
-            try:
+            self._apply_registrations([registration])
+            
+            logger.info(f"Successfully registered QA task: {registration.name} v{version}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to register task {task_class.__name__}: {e}")
+            return False
+    
+    def _prepare_registration(
+        self, 
+        task_class: Type[QATask],
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        version: str = "1.0.0",
+        canvas_permissions: Optional[List[str]] = None,
+        **metadata
+    ) -> Optional["_Registration"]:
+        """
+        Validate a task class and build its registration record without
+        modifying the registry.
+        
+        Returns:
+            Registration record, or None if the task can't be registered
+        """
+        # Validate task class
+        if not issubclass(task_class, QATask):
+            logger.error(f"Task class {task_class.__name__} must inherit from QATask")
+            return None
+        
+        # Check class structure once here rather than on every validate_task call
+        missing_methods = tuple(
+            method_name for method_name in _REQUIRED_TASK_METHODS
+            if inspect.getattr_static(task_class, method_name, None) is None
+        )
+        
+        # Get task info from the class
+        try:
+            if isinstance(
+                inspect.getattr_static(task_class, 'get_task_info', None),
+                (classmethod, staticmethod)
+            ):
+                # Class-level metadata - no need to pay for task construction
+                task_info = task_class.get_task_info()
+            else:
                 # Create a temporary instance to get task info
                 temp_instance = task_class()
                 task_info = temp_instance.get_task_info()
-            except Exception as e:
-                logger.error(f"Failed to get task info for {task_class.__name__}: {e}")
-                return False
-            
-            # Use provided name or default to task info name
-            task_name = name or task_info.name
-            
-            # Check for conflicts
-            if task_name in self._tasks:
-                existing_info = self._task_info[task_name]
-                logger.warning(f"Task '{task_name}' already registered (v{existing_info.version})")
-                
-                # Allow version updates
-                if version > existing_info.version:
-                    logger.info(f"Updating task '{task_name}' from v{existing_info.version} to v{version}")
-                else:
-                    logger.error(f"Task '{task_name}' v{version} conflicts with existing v{existing_info.version}")
-                    return False
+        except Exception as e:
+            logger.error(f"Failed to get task info for {task_class.__name__}: {e}")
+            return None
+        
+        # Use provided name or default to task info name (interned for fast dict probes)
+        task_name = sys.intern(name or task_info.name)
+        
+        # Parse the version once; comparisons then use release tuples, not strings
+        try:
+            parsed_version = Version(version)
+        except InvalidVersion:
+            logger.error(f"Task '{task_name}' has invalid version '{version}'")
+            return None
+        
+        # Check for conflicts
+        if task_name in self._tasks:
+            existing_metadata = self._task_metadata[task_name]
+            existing_version = existing_metadata['version']
+            logger.warning(f"Task '{task_name}' already registered (v{existing_version})")
             
-            # Register the task
-            self._tasks[task_name] = task_class
-            self._task_info[task_name] = task_info
-            self._task_metadata[task_name] = {
+            # Allow version updates
+            if parsed_version > existing_metadata['_parsed_version']:
+                logger.info(f"Updating task '{task_name}' from v{existing_version} to v{version}")
+            else:
+                logger.error(f"Task '{task_name}' v{version} conflicts with existing v{existing_version}")
+                return None
+        
+        # Snapshot task info so later mutation of the instance's copy can't leak in
+        task_info = task_info.model_copy()
+        
+        return _Registration(
+            name=task_name,
+            task_class=task_class,
+            task_info=task_info,
+            metadata={
                 'name': task_name,
                 'description': description or task_info.description,
                 'version': version,
+                '_parsed_version': parsed_version,
                 'canvas_permissions': canvas_permissions or task_info.required_canvas_permissions,
                 'class_name': task_class.__name__,
                 'module': task_class.__module__,
+                'content_type_values': tuple(
+                    CanvasContentType(ct).value for ct in task_info.supported_content_types
+                ),
+                'permissions_tuple': tuple(task_info.required_canvas_permissions),
+                '_methods_ok': not missing_methods,
+                '_missing_methods': missing_methods,
                 **metadata
             }
-            
-            logger.info(f"Successfully registered QA task: {task_name} v{version}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to register task {task_class.__name__}: {e}")
-            return False
+        )
+    
+    def _apply_registrations(self, registrations: List["_Registration"]):
+        """Apply prepared registrations to the registry in bulk"""
+        for registration in registrations:
+            # Drop any previous registration from the indexes before replacing it
+            if registration.name in self._tasks:
+                self._deindex_task(registration.name)
+        
+        self._tasks.update((r.name, r.task_class) for r in registrations)
+        self._task_info.update((r.name, r.task_info) for r in registrations)
+        self._task_metadata.update((r.name, r.metadata) for r in registrations)
+        
+        for registration in registrations:
+            self._index_task(registration.name)
     
     def unregister_task(self, name: str) -> bool:
         """
@@ -120,6 +211,7 @@ class QATaskRegistry:
             logger.warning(f"Task '{name}' not found for unregistration")
             return False
         
+        self._deindex_task(name)
         del self._tasks[name]
         del self._task_info[name]
         del self._task_metadata[name]
@@ -127,6 +219,61 @@ class QATaskRegistry:
         logger.info(f"Unregistered QA task: {name}")
         return True
     
+    def _index_task(self, name: str):
+        """Add a registered task to the by-type index and stats counters"""
+        task_type = QATaskType(self._task_info[name].task_type)
+        self._tasks_by_type.setdefault(task_type, []).append(name)
+        self._type_counts[task_type.value] += 1
+        self._version_counts[self._task_metadata[name].get('version', 'unknown')] += 1
+        self._tasks_by_module[self._task_metadata[name]['module']].add(name)
+    
+    def _deindex_task(self, name: str):
+        """Remove a registered task from the by-type index and stats counters"""
+        task_type = QATaskType(self._task_info[name].task_type)
+        names = self._tasks_by_type.get(task_type)
+        if names and name in names:
+            names.remove(name)
+            if not names:
+                del self._tasks_by_type[task_type]
+        
+        self._decrement(self._type_counts, task_type.value)
+        self._decrement(self._version_counts, self._task_metadata[name].get('version', 'unknown'))
+        
+        module_name = self._task_metadata[name]['module']
+        module_tasks = self._tasks_by_module.get(module_name)
+        if module_tasks is not None:
+            module_tasks.discard(name)
+            if not module_tasks:
+                del self._tasks_by_module[module_name]
+    
+    def _track_module(self, module_name: str):
+        """Record a loaded task module under each of its parent packages"""
+        self._registered_modules.add(module_name)
+        package_path = module_name
+        while '.' in package_path:
+            package_path = package_path.rpartition('.')[0]
+            self._modules_by_package[package_path].add(module_name)
+    
+    def _untrack_module(self, module_name: str):
+        """Forget a task module and remove it from the package index"""
+        self._registered_modules.discard(module_name)
+        self._module_mtimes.pop(module_name, None)
+        package_path = module_name
+        while '.' in package_path:
+            package_path = package_path.rpartition('.')[0]
+            package_modules = self._modules_by_package.get(package_path)
+            if package_modules is not None:
+                package_modules.discard(module_name)
+                if not package_modules:
+                    del self._modules_by_package[package_path]
+    
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str):
+        """Decrement a histogram bucket, dropping it when empty"""
+        counts[key] -= 1
+        if counts[key] <= 0:
+            del counts[key]
+    
     def get_task_class(self, name: str) -> Optional[Type[QATask]]:
         """Get registered task class by name"""
         return self._tasks.get(name)
@@ -153,10 +300,7 @@ class QATaskRegistry:
     
     def get_tasks_by_type(self, task_type: QATaskType) -> List[str]:
         """Get tasks filtered by type"""
-        return [
-            name for name, info in self._task_info.items()
-            if info.task_type == task_type
-        ]
+        return list(self._tasks_by_type.get(task_type, ()))
     
     def validate_task(self, name: str) -> ValidationResult:
         """
@@ -174,13 +318,12 @@ class QATaskRegistry:
             result.add_error(f"Task '{name}' not found")
             return result
         
-        task_class = self._tasks[name]
         task_info = self._task_info[name]
+        task_metadata = self._task_metadata[name]
         
-        # Validate task class structure
-        required_methods = ['execute', 'get_task_info', 'validate_config', 'get_config_schema']
-        for method_name in required_methods:
-            if not hasattr(task_class, method_name):
+        # Validate task class structure (checked once at registration)
+        if not task_metadata.get('_methods_ok', True):
+            for method_name in task_metadata['_missing_methods']:
                 result.add_error(f"Task class missing required method: {method_name}")
         
         # Validate task info completeness
@@ -208,6 +351,8 @@ class QATaskRegistry:
             Number of tasks discovered and registered
         """
         discovered_count = 0
+        package_path = sys.intern(package_path)
+        pending: Dict[str, _Registration] = {}
         
         try:
             # Import the tasks package
@@ -217,52 +362,77 @@ class QATaskRegistry:
                 logger.warning(f"Tasks package '{package_path}' not found - skipping discovery")
                 return 0
             
-            # Get package directory
-            if hasattr(package, '__path__'):
-                package_dir = package.__path__[0]
-            else:
+            # Get package search path
+            if not hasattr(package, '__path__'):
                 logger.warning(f"Package '{package_path}' has no __path__ - skipping discovery")
                 return 0
             
-            # Discover modules in the package
-            for finder, module_name, ispkg in pkgutil.iter_modules([package_dir]):
-                if ispkg:
-                    # Recursively discover subpackages
-                    sub_package_path = f"{package_path}.{module_name}"
-                    discovered_count += self.discover_tasks(sub_package_path)
+            def on_walk_error(failed_package: str):
+                logger.error(f"Failed to load package '{failed_package}' during task discovery")
+            
+            # Discover modules in the package and all subpackages in a single pass
+            for module_info in pkgutil.walk_packages(
+                package.__path__, prefix=f"{package_path}.", onerror=on_walk_error
+            ):
+                if module_info.ispkg:
                     continue
                 
-                full_module_name = f"{package_path}.{module_name}"
+                full_module_name = sys.intern(module_info.name)
+                mtime = self._get_module_mtime(
+                    getattr(module_info.module_finder, 'path', ''),
+                    full_module_name.rpartition('.')[2]
+                )
+                already_loaded = full_module_name in self._registered_modules
                 
-                # Skip already loaded modules unless in development mode
-                if full_module_name in self._registered_modules:
+                # Skip already loaded modules whose source hasn't changed
+                if already_loaded and self._module_mtimes.get(full_module_name) == mtime:
                     continue
                 
                 try:
-                    # Import the module
-                    module = importlib.import_module(full_module_name)
-                    self._registered_modules.add(full_module_name)
+                    if already_loaded and full_module_name in sys.modules:
+                        # Source changed since last discovery - swap in the new code
+                        self._unregister_module_tasks(full_module_name)
+                        module = importlib.reload(sys.modules[full_module_name])
+                    else:
+                        # Import the module
+                        module = importlib.import_module(full_module_name)
+                    self._track_module(full_module_name)
+                    self._module_mtimes[full_module_name] = mtime
                     
-                    # Find QA task classes in the module
-                    for name, obj in inspect.getmembers(module, inspect.isclass):
-                        if (issubclass(obj, QATask) and 
-                            obj != QATask and 
-                            obj.__module__ == full_module_name):
-                            
-                            # Check if class has registration decorator metadata
-                            if hasattr(obj, '_qa_task_metadata'):
-                                metadata = obj._qa_task_metadata
-                                if self.register_task(obj, **metadata):
-                                    discovered_count += 1
-                            else:
-                                # Try to register with default metadata
-                                if self.register_task(obj):
-                                    discovered_count += 1
+                    # Find QA task classes defined in the module (skipping imported names)
+                    for obj in list(vars(module).values()):
+                        if not isinstance(obj, type):
+                            continue
+                        if obj.__module__ != full_module_name:
+                            continue
+                        if not issubclass(obj, QATask) or obj is QATask:
+                            continue
+                        
+                        # Use registration decorator metadata when present
+                        metadata = getattr(obj, '_qa_task_metadata', None) or {}
+                        registration = self._prepare_registration(obj, **metadata)
+                        if registration is None:
+                            continue
+                        
+                        # Two discovered classes claiming one name: keep the newer version
+                        existing = pending.get(registration.name)
+                        if (existing is not None and
+                                registration.metadata['_parsed_version'] <= existing.metadata['_parsed_version']):
+                            logger.error(
+                                f"Task '{registration.name}' v{registration.metadata['version']} conflicts "
+                                f"with discovered v{existing.metadata['version']}"
+                            )
+                            continue
+                        pending[registration.name] = registration
                     
                 except Exception as e:
                     logger.error(f"Failed to load module '{full_module_name}': {e}")
                     continue
             
+            # Register everything discovered in one bulk update
+            self._apply_registrations(list(pending.values()))
+            discovered_count = len(pending)
+            
             logger.info(f"Task discovery completed: {discovered_count} tasks found in '{package_path}'")
             
         except Exception as e:
@@ -270,6 +440,19 @@ class QATaskRegistry:
         
         return discovered_count
     
+    @staticmethod
+    def _get_module_mtime(package_dir: str, module_name: str) -> Optional[int]:
+        """Get the source file mtime of a module, or None if it can't be read"""
+        try:
+            return (Path(package_dir) / f"{module_name}.py").stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def _unregister_module_tasks(self, module_name: str):
+        """Unregister all tasks defined in a module"""
+        for task_name in list(self._tasks_by_module.get(module_name, ())):
+            self.unregister_task(task_name)
+    
     def reload_tasks(self, package_path: str = "app.qa_framework.tasks") -> int:
         """
         Reload tasks for development hot-reload.
@@ -280,50 +463,35 @@ class QATaskRegistry:
         Returns:
             Number of tasks reloaded
         """
-        # Clear registered modules to force reload
-        modules_to_reload = [m for m in self._registered_modules if m.startswith(package_path)]
-        for module_name in modules_to_reload:
-            self._registered_modules.discard(module_name)
-            
-            # Reload the module if it's already imported
-            if module_name in importlib.sys.modules:
-                try:
-                    importlib.reload(importlib.sys.modules[module_name])
-                except Exception as e:
-                    logger.error(f"Failed to reload module '{module_name}': {e}")
-        
-        # Clear existing tasks from this package
-        tasks_to_remove = []
-        for task_name, metadata in self._task_metadata.items():
-            if metadata.get('module', '').startswith(package_path):
-                tasks_to_remove.append(task_name)
+        # Drop modules whose source file no longer exists, along with their tasks
+        loaded_modules = list(self._modules_by_package.get(package_path, ()))
+        for module_name in loaded_modules:
+            source_file = getattr(sys.modules.get(module_name), '__file__', None)
+            if not source_file or not os.path.exists(source_file):
+                self._unregister_module_tasks(module_name)
+                self._untrack_module(module_name)
         
-        for task_name in tasks_to_remove:
-            self.unregister_task(task_name)
-        
-        # Re-discover tasks
+        # Re-discover tasks: only modules whose source mtime changed are reloaded
+        # and re-registered, unchanged modules are skipped
         return self.discover_tasks(package_path)
     
     def get_registry_stats(self) -> Dict[str, Any]:
         """Get registry statistics"""
-        stats = {
+        return {
             'total_tasks': len(self._tasks),
             'registered_modules': len(self._registered_modules),
-            'tasks_by_type': {},
-            'tasks_by_version': {},
+            'tasks_by_type': dict(self._type_counts),
+            'tasks_by_version': dict(self._version_counts),
         }
-        
-        # Count by type
-        for info in self._task_info.values():
-            task_type = info.task_type.value
-            stats['tasks_by_type'][task_type] = stats['tasks_by_type'].get(task_type, 0) + 1
-        
-        # Count by version
-        for metadata in self._task_metadata.values():
-            version = metadata.get('version', 'unknown')
-            stats['tasks_by_version'][version] = stats['tasks_by_version'].get(version, 0) + 1
-        
-        return stats
+
+
+@dataclass
+class _Registration:
+    """Prepared task registration, applied by QATaskRegistry._apply_registrations"""
+    name: str
+    task_class: Type[QATask]
+    task_info: TaskInfo
+    metadata: Dict[str, Any]
 
 
 # Global registry instance
@@ -11,10 +11,14 @@ This task inherits from the QA framework and provides real-time progress trackin
 Canvas API rate limiting, and comprehensive error handling.
 """
 
+import asyncio
 import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 
 from qa_framework.base import (
     QATask, 
@@ -31,12 +35,104 @@ from qa_framework.base import (
     QATaskConfigError,
     QATaskExecutionError
 )
-from qa_framework.utils import handle_qa_error, ErrorCategory
-from app.services.canvas_service import CanvasService
+from qa_framework.utils import handle_qa_error, ErrorCategory, URLReplacer, replace_urls_in_content
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _ItemReplacements:
+    """
+    URL replacements made in a single content item.
+    
+    Item metadata is kept once instead of being copied into a QAFinding per
+    replacement; findings are built by iter_findings() when results are assembled.
+    """
+    content_type: CanvasContentType
+    content_id: str
+    content_title: str
+    content_url: str
+    location: str
+    replacements: List[Tuple[str, str]]
+    additional_data: Dict[str, Any] = field(default_factory=dict)
+    update_success: bool = False
+    
+    def iter_findings(self) -> Iterator[QAFinding]:
+        """Yield one QAFinding per replacement"""
+        for old_url, new_url in self.replacements:
+            yield QAFinding(
+                content_type=self.content_type,
+                content_id=self.content_id,
+                content_title=self.content_title,
+                content_url=self.content_url,
+                finding_type="url_replaced",
+                description=f"Replaced URL in {self.location}: {old_url} → {new_url}",
+                severity="info",
+                old_value=old_url,
+                new_value=new_url,
+                additional_data={"update_success": self.update_success, **self.additional_data}
+            )
+
+
+class _CachedCanvasService:
+    """
+    Per-execution wrapper around the Canvas service that dedupes content GETs.
+    
+    Concurrent requests for the same item share one in-flight call. The cache
+    lives only as long as a single execute(), so content never goes stale
+    across runs. Everything else is passed straight through.
+    """
+    
+    def __init__(self, canvas_service):
+        self._canvas_service = canvas_service
+        self._get_cache: Dict[tuple, asyncio.Future] = {}
+    
+    def __getattr__(self, name: str):
+        return getattr(self._canvas_service, name)
+    
+    async def __aenter__(self):
+        # Services that pool connections open their session once here, not per request
+        if hasattr(type(self._canvas_service), '__aenter__'):
+            await self._canvas_service.__aenter__()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._get_cache.clear()
+        if hasattr(type(self._canvas_service), '__aexit__'):
+            await self._canvas_service.__aexit__(exc_type, exc_val, exc_tb)
+    
+    async def get_course(self, course_id: str):
+        return await self._cached(('course', course_id), self._canvas_service.get_course, course_id)
+    
+    async def get_syllabus(self, course_id: str):
+        return await self._cached(('syllabus', course_id), self._canvas_service.get_syllabus, course_id)
+    
+    async def get_page(self, course_id: str, page_url: str):
+        return await self._cached(('page', course_id, page_url), self._canvas_service.get_page, course_id, page_url)
+    
+    async def _cached(self, key: tuple, fetch: Callable[..., Awaitable[Any]], *args):
+        future = self._get_cache.get(key)
+        if future is not None:
+            return await future
+        
+        future = asyncio.get_running_loop().create_future()
+        self._get_cache[key] = future
+        try:
+            result = await fetch(*args)
+        except BaseException as e:
+            # Don't cache failures - waiters see this one, later callers retry
+            del self._get_cache[key]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        
+        future.set_result(result)
+        return result
+
+
 @register_qa_task(
     name="find_replace",
     description="URL find and replace scanning for Canvas course content",
@@ -52,7 +148,11 @@ class FindReplaceQATask(QATask):
     announcements, and modules.
     """
     
-    def get_task_info(self) -> TaskInfo:
+    # Per-task cap on in-flight Canvas requests (Canvas throttles concurrent requests per user)
+    max_concurrent_requests = 10
+    
+    @classmethod
+    def get_task_info(cls) -> TaskInfo:
         """Get task metadata and information"""
         return TaskInfo(
             name="Find & Replace URLs",
@@ -110,6 +210,10 @@ class FindReplaceQATask(QATask):
             result.add_error("At least one URL mapping is required")
             return result
         
+        # Count find URLs once up front for duplicate detection
+        find_counts = Counter(m['find'].strip() for m in config.url_mappings if 'find' in m)
+        reported_duplicates = set()
+        
         # Validate each URL mapping
         for i, mapping in enumerate(config.url_mappings):
             if 'find' not in mapping or 'replace' not in mapping:
@@ -132,17 +236,19 @@ class FindReplaceQATask(QATask):
             if replace_url and not self._is_valid_url(replace_url):
                 result.add_warning(f"URL mapping {i+1}: 'replace' URL may not be valid: {replace_url}")
             
-            # Check for duplicate find URLs
-            find_urls = [m['find'] for m in config.url_mappings if 'find' in m]
-            if find_urls.count(find_url) > 1:
+            # Check for duplicate find URLs (reported once per URL; empty ones are reported above)
+            if find_url and find_counts[find_url] > 1 and find_url not in reported_duplicates:
+                reported_duplicates.add(find_url)
                 result.add_error(f"Duplicate 'find' URL found: {find_url}")
         
         # Validate content types
         if not config.content_types:
             result.add_warning("No content types specified - will scan all supported content types")
         else:
-            invalid_types = [ct for ct in config.content_types if ct not in self.supports_content_types()]
-            if invalid_types:
+            supported_types = self._supported_types_set
+            # issuperset() stops at the first unsupported type; only then build the list
+            if not supported_types.issuperset(config.content_types):
+                invalid_types = [ct for ct in config.content_types if ct not in supported_types]
                 result.add_error(f"Unsupported content types: {invalid_types}")
         
         # Validate Canvas context
@@ -208,6 +314,14 @@ class FindReplaceQATask(QATask):
                     "title": "Include HTML Attributes",
                     "description": "Whether to scan HTML attributes (href, data-api-endpoint, etc.)",
                     "default": True
+                },
+                "max_concurrent_content_types": {
+                    "type": "integer",
+                    "title": "Concurrent Content Types",
+                    "description": "How many content types to process at the same time",
+                    "minimum": 1,
+                    "maximum": 8,
+                    "default": 4
                 }
             },
             "required": ["url_mappings"]
@@ -235,6 +349,8 @@ class FindReplaceQATask(QATask):
         # Create result object
         result = self.create_base_result(config)
         result.started_at = datetime.utcnow()
+        # Duration comes from the monotonic clock; the datetimes are display timestamps
+        started = time.perf_counter()
         
         try:
             # Initialize progress
@@ -243,79 +359,110 @@ class FindReplaceQATask(QATask):
                 "Initializing Find & Replace QA task"
             )
             
-            # Get Canvas service and course info
-            canvas_service = await self._get_canvas_service(config, canvas_context)
-            course_info = await self._get_course_info(canvas_service, config.course_id)
-            
-            logger.info(f"Starting Find & Replace QA for course: {course_info.get('name', 'Unknown')} (ID: {config.course_id})")
-            
-            # Determine content types to process
-            content_types = config.content_types or list(CanvasContentType)
-            total_content_types = len(content_types)
-            
-            await progress_tracker.update_progress(
-                current=1,
-                total=total_content_types + 2,  # +2 for init and completion
-                message=f"Processing {total_content_types} content types"
-            )
-            
-            # Process each content type
-            processed_count = 0
-            for i, content_type in enumerate(content_types):
-                try:
-                    await progress_tracker.start_stage(
-                        ProgressStage.PROCESSING,
-                        f"Processing {content_type.value} content"
-                    )
+            # Get Canvas service (one pooled session for the whole run) and course info
+            async with await self._get_canvas_service(config, canvas_context) as canvas_service:
+                course_info = await self._get_course_info(canvas_service, config.course_id)
+                
+                logger.info(f"Starting Find & Replace QA for course: {course_info.get('name', 'Unknown')} (ID: {config.course_id})")
+                
+                # Determine content types to process
+                content_types = [CanvasContentType(ct) for ct in (config.content_types or CanvasContentType)]
+                total_content_types = len(content_types)
+                
+                await progress_tracker.update_progress(
+                    current=1,
+                    total=total_content_types + 2,  # +2 for init and completion
+                    message=f"Processing {total_content_types} content types"
+                )
+                
+                await progress_tracker.start_stage(
+                    ProgressStage.PROCESSING,
+                    f"Processing {total_content_types} content types"
+                )
+                
+                # Compiled URL mappings for every content item in this run (shared
+                # with earlier runs that used the same mappings and options)
+                url_replacer = URLReplacer.for_config(config.url_mappings, config)
+                
+                # Content types are independent Canvas workflows, so overlap them (bounded)
+                semaphore = asyncio.Semaphore(config.max_concurrent_content_types)
+                progress_step = 1  # init
+                
+                # Item-level progress shares the tracker with the per-type steps, so it
+                # is only reported when content types run one at a time
+                item_progress_tracker = (
+                    progress_tracker
+                    if config.max_concurrent_content_types == 1 or total_content_types == 1
+                    else None
+                )
+                
+                async def process_guarded(content_type: CanvasContentType) -> List[_ItemReplacements]:
+                    nonlocal progress_step
+                    async with semaphore:
+                        try:
+                            replaced_items = await self._process_content_type(
+                                canvas_service, 
+                                config, 
+                                content_type, 
+                                course_info,
+                                item_progress_tracker,
+                                url_replacer
+                            )
+                        except Exception as e:
+                            logger.error(f"Error processing {content_type.value}: {e}")
+                            await progress_tracker.report_error(e, {"content_type": content_type.value})
+                            raise
                     
-                    findings = await self._process_content_type(
-                        canvas_service, 
-                        config, 
-                        content_type, 
-                        course_info,
-                        progress_tracker
+                    progress_step += 1
+                    finding_count = sum(len(item.replacements) for item in replaced_items)
+                    await progress_tracker.update_progress(
+                        current=progress_step,
+                        total=total_content_types + 2,
+                        message=f"Completed {content_type.value}: {finding_count} findings"
                     )
+                    return replaced_items
+                
+                outcomes = await asyncio.gather(
+                    *(process_guarded(content_type) for content_type in content_types),
+                    return_exceptions=True
+                )
+                
+                # Merge results in content type order
+                processed_count = 0
+                for content_type, replaced_items in zip(content_types, outcomes, strict=True):
+                    if isinstance(replaced_items, BaseException):
+                        # Already reported - continue with other content types
+                        continue
                     
                     # Add findings to result
-                    for finding in findings:
-                        result.add_finding(finding)
+                    findings_before = result.total_findings
+                    for item in replaced_items:
+                        for finding in item.iter_findings():
+                            result.add_finding(finding)
                     
                     processed_count += 1
                     result.content_types_processed.append(content_type)
-                    result.items_by_content_type[content_type.value] = len(findings)
-                    
-                    await progress_tracker.update_progress(
-                        current=i + 2,  # +1 for init
-                        total=total_content_types + 2,
-                        message=f"Completed {content_type.value}: {len(findings)} findings"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {content_type.value}: {e}")
-                    await progress_tracker.report_error(e, {"content_type": content_type.value})
-                    
-                    # Continue with other content types
-                    continue
-            
-            # Complete the task
-            await progress_tracker.start_stage(
-                ProgressStage.COMPLETED,
-                "Finalizing results"
-            )
-            
-            result.completed_at = datetime.utcnow()
-            result.execution_time_seconds = (result.completed_at - result.started_at).total_seconds()
-            result.total_items_scanned = sum(result.items_by_content_type.values())
-            
-            await progress_tracker.update_progress(
-                current=total_content_types + 2,
-                total=total_content_types + 2,
-                message=f"Task completed: {result.total_findings} URLs replaced across {processed_count} content types"
-            )
-            
-            logger.info(f"Find & Replace QA completed: {result.total_findings} findings, {result.total_items_scanned} items scanned")
-            
-            return result
+                    result.items_by_content_type[content_type.value] = result.total_findings - findings_before
+                
+                # Complete the task
+                await progress_tracker.start_stage(
+                    ProgressStage.COMPLETED,
+                    "Finalizing results"
+                )
+                
+                result.completed_at = datetime.utcnow()
+                result.execution_time_seconds = time.perf_counter() - started
+                result.total_items_scanned = sum(result.items_by_content_type.values())
+                
+                await progress_tracker.update_progress(
+                    current=total_content_types + 2,
+                    total=total_content_types + 2,
+                    message=f"Task completed: {result.total_findings} URLs replaced across {processed_count} content types"
+                )
+                
+                logger.info(f"Find & Replace QA completed: {result.total_findings} findings, {result.total_items_scanned} items scanned")
+                
+                return result
             
         except Exception as e:
             # Handle execution error
@@ -335,12 +482,15 @@ class FindReplaceQATask(QATask):
     
     async def _get_canvas_service(self, config: FindReplaceConfig, canvas_context: Optional[Dict[str, Any]]):
         """Get Canvas service instance with authentication"""
+        # Imported here so loading the task registry doesn't pull in the HTTP client stack
+        from app.services.canvas_service import CanvasService
+        
         # This will be implemented when we create the Canvas service
         # For now, create a placeholder
-        return CanvasService(
+        return _CachedCanvasService(CanvasService(
             base_url=config.canvas_instance_url,
             access_token=canvas_context.get('access_token') if canvas_context else None
-        )
+        ))
     
     async def _get_course_info(self, canvas_service, course_id: str) -> Dict[str, Any]:
         """Get course information"""
@@ -356,36 +506,37 @@ class FindReplaceQATask(QATask):
         config: FindReplaceConfig, 
         content_type: CanvasContentType,
         course_info: Dict[str, Any],
-        progress_tracker: ProgressTracker
-    ) -> List[QAFinding]:
+        progress_tracker: Optional[ProgressTracker],
+        url_replacer: URLReplacer
+    ) -> List[_ItemReplacements]:
         """Process a specific content type for URL replacements"""
-        findings = []
+        replaced_items = []
         
         try:
             if content_type == CanvasContentType.SYLLABUS:
-                findings = await self._process_syllabus(canvas_service, config, course_info)
+                replaced_items = await self._process_syllabus(canvas_service, config, course_info, url_replacer)
             elif content_type == CanvasContentType.PAGES:
-                findings = await self._process_pages(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_pages(canvas_service, config, course_info, progress_tracker, url_replacer)
             elif content_type == CanvasContentType.ASSIGNMENTS:
-                findings = await self._process_assignments(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_assignments(canvas_service, config, course_info, progress_tracker, url_replacer)
             elif content_type == CanvasContentType.QUIZZES:
-                findings = await self._process_quizzes(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_quizzes(canvas_service, config, course_info, progress_tracker)
             elif content_type == CanvasContentType.DISCUSSIONS:
-                findings = await self._process_discussions(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_discussions(canvas_service, config, course_info, progress_tracker)
             elif content_type == CanvasContentType.ANNOUNCEMENTS:
-                findings = await self._process_announcements(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_announcements(canvas_service, config, course_info, progress_tracker)
             elif content_type == CanvasContentType.MODULES:
-                findings = await self._process_modules(canvas_service, config, course_info, progress_tracker)
+                replaced_items = await self._process_modules(canvas_service, config, course_info, progress_tracker)
             
         except Exception as e:
             logger.error(f"Error processing {content_type.value}: {e}")
             raise
         
-        return findings
+        return replaced_items
     
-    async def _process_syllabus(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any]) -> List[QAFinding]:
+    async def _process_syllabus(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], url_replacer: URLReplacer) -> List[_ItemReplacements]:
         """Process syllabus content"""
-        findings = []
+        replaced_items = []
         
         try:
             # Get syllabus content
@@ -395,181 +546,294 @@ class FindReplaceQATask(QATask):
                 content = syllabus_data['syllabus_body']
                 
                 # Use canvas scanner utility to find and replace URLs
-                new_content, replacements = await self._scan_and_replace_content(content, config)
+                new_content, replacements = await self._scan_and_replace_content(content, config, url_replacer)
                 
                 if replacements:
                     # Update syllabus
                     success = await canvas_service.update_syllabus(config.course_id, new_content)
                     
-                    # Create findings
-                    for old_url, new_url in replacements:
-                        findings.append(QAFinding(
-                            content_type=CanvasContentType.SYLLABUS,
-                            content_id=config.course_id,
-                            content_title="Course Syllabus",
-                            content_url=f"{config.canvas_instance_url}/courses/{config.course_id}/assignments/syllabus",
-                            finding_type="url_replaced",
-                            description=f"Replaced URL in syllabus: {old_url} → {new_url}",
-                            severity="info",
-                            old_value=old_url,
-                            new_value=new_url,
-                            additional_data={
-                                "update_success": success,
-                                "content_length": len(content)
-                            }
-                        ))
+                    replaced_items.append(_ItemReplacements(
+                        content_type=CanvasContentType.SYLLABUS,
+                        content_id=config.course_id,
+                        content_title="Course Syllabus",
+                        content_url=f"{config.canvas_instance_url}/courses/{config.course_id}/assignments/syllabus",
+                        location="syllabus",
+                        replacements=replacements,
+                        additional_data={
+                            "content_length": len(content)
+                        },
+                        update_success=success
+                    ))
                         
         except Exception as e:
             logger.error(f"Error processing syllabus: {e}")
             raise
         
-        return findings
+        return replaced_items
     
-    async def _process_pages(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_pages(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker], url_replacer: URLReplacer) -> List[_ItemReplacements]:
         """Process page content"""
-        findings = []
-        
         try:
             # Get all pages
             pages = await canvas_service.get_pages(config.course_id)
-            total_pages = len(pages)
             
-            for i, page in enumerate(pages):
-                try:
-                    # Get page details
-                    page_data = await canvas_service.get_page(config.course_id, page['url'])
-                    
-                    if page_data and page_data.get('body'):
-                        content = page_data['body']
-                        new_content, replacements = await self._scan_and_replace_content(content, config)
-                        
-                        if replacements:
-                            # Update page
-                            success = await canvas_service.update_page(config.course_id, page['url'], new_content)
-                            
-                            # Create findings
-                            for old_url, new_url in replacements:
-                                findings.append(QAFinding(
-                                    content_type=CanvasContentType.PAGES,
-                                    content_id=page['url'],
-                                    content_title=page.get('title', 'Untitled Page'),
-                                    content_url=page.get('html_url', ''),
-                                    finding_type="url_replaced",
-                                    description=f"Replaced URL in page '{page.get('title', 'Untitled')}': {old_url} → {new_url}",
-                                    severity="info",
-                                    old_value=old_url,
-                                    new_value=new_url,
-                                    additional_data={
-                                        "update_success": success,
-                                        "page_url": page['url']
-                                    }
-                                ))
-                    
-                    # Update progress
-                    if i % 5 == 0:  # Update every 5 pages
-                        await progress_tracker.update_progress(
-                            current=i + 1,
-                            total=total_pages,
-                            message=f"Processed {i + 1}/{total_pages} pages"
-                        )
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing page {page.get('url', 'unknown')}: {e}")
-                    continue
+            # Scan everything first, buffering updates by page URL, then send them together
+            pending_updates: Dict[str, str] = {}
+            replaced_items = await self._process_items(
+                pages,
+                lambda page: self._process_page(canvas_service, config, page, pending_updates, url_replacer),
+                progress_tracker,
+                "pages"
+            )
+            
+            await self._flush_updates(
+                pending_updates,
+                lambda page_url, new_content: canvas_service.update_page(config.course_id, page_url, new_content),
+                replaced_items,
+                "page_url"
+            )
+            
+            return replaced_items
                     
         except Exception as e:
             logger.error(f"Error processing pages: {e}")
             raise
+    
+    async def _process_page(
+        self,
+        canvas_service,
+        config: FindReplaceConfig,
+        page: Dict[str, Any],
+        pending_updates: Dict[str, str],
+        url_replacer: URLReplacer
+    ) -> List[_ItemReplacements]:
+        """Fetch and scan a single page, buffering its update in pending_updates"""
+        replaced_items = []
+        
+        try:
+            # Get page details
+            page_data = await canvas_service.get_page(config.course_id, page['url'])
+            
+            if page_data and page_data.get('body'):
+                content = page_data['body']
+                new_content, replacements = await self._scan_and_replace_content(content, config, url_replacer)
+                
+                if replacements:
+                    # Queue page update
+                    pending_updates[page['url']] = new_content
+                    
+                    replaced_items.append(_ItemReplacements(
+                        content_type=CanvasContentType.PAGES,
+                        content_id=page['url'],
+                        content_title=page.get('title', 'Untitled Page'),
+                        content_url=page.get('html_url', ''),
+                        location=f"page '{page.get('title', 'Untitled')}'",
+                        replacements=replacements,
+                        additional_data={
+                            "page_url": page['url']
+                        }
+                    ))
+                
+        except Exception as e:
+            logger.warning(f"Error processing page {page.get('url', 'unknown')}: {e}")
         
-        return findings
+        return replaced_items
     
-    async def _process_assignments(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_assignments(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker], url_replacer: URLReplacer) -> List[_ItemReplacements]:
         """Process assignment content"""
-        findings = []
-        
         try:
             assignments = await canvas_service.get_assignments(config.course_id)
-            total_assignments = len(assignments)
             
-            for i, assignment in enumerate(assignments):
-                try:
-                    if assignment.get('description'):
-                        content = assignment['description']
-                        new_content, replacements = await self._scan_and_replace_content(content, config)
-                        
-                        if replacements:
-                            success = await canvas_service.update_assignment(config.course_id, assignment['id'], new_content)
-                            
-                            for old_url, new_url in replacements:
-                                findings.append(QAFinding(
-                                    content_type=CanvasContentType.ASSIGNMENTS,
-                                    content_id=str(assignment['id']),
-                                    content_title=assignment.get('name', 'Untitled Assignment'),
-                                    content_url=assignment.get('html_url', ''),
-                                    finding_type="url_replaced",
-                                    description=f"Replaced URL in assignment '{assignment.get('name', 'Untitled')}': {old_url} → {new_url}",
-                                    severity="info",
-                                    old_value=old_url,
-                                    new_value=new_url,
-                                    additional_data={
-                                        "update_success": success,
-                                        "assignment_id": assignment['id']
-                                    }
-                                ))
-                    
-                    if i % 5 == 0:
-                        await progress_tracker.update_progress(
-                            current=i + 1,
-                            total=total_assignments,
-                            message=f"Processed {i + 1}/{total_assignments} assignments"
-                        )
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing assignment {assignment.get('id', 'unknown')}: {e}")
-                    continue
+            pending_updates: Dict[Any, str] = {}
+            replaced_items = await self._process_items(
+                assignments,
+                lambda assignment: self._process_assignment(config, assignment, pending_updates, url_replacer),
+                progress_tracker,
+                "assignments"
+            )
+            
+            await self._flush_updates(
+                pending_updates,
+                lambda assignment_id, new_content: canvas_service.update_assignment(
+                    config.course_id, assignment_id, new_content
+                ),
+                replaced_items,
+                "assignment_id"
+            )
+            
+            return replaced_items
                     
         except Exception as e:
             logger.error(f"Error processing assignments: {e}")
             raise
+    
+    async def _process_assignment(
+        self,
+        config: FindReplaceConfig,
+        assignment: Dict[str, Any],
+        pending_updates: Dict[Any, str],
+        url_replacer: URLReplacer
+    ) -> List[_ItemReplacements]:
+        """Scan a single assignment, buffering its update in pending_updates"""
+        replaced_items = []
         
-        return findings
+        try:
+            if assignment.get('description'):
+                content = assignment['description']
+                new_content, replacements = await self._scan_and_replace_content(content, config, url_replacer)
+                
+                if replacements:
+                    pending_updates[assignment['id']] = new_content
+                    
+                    replaced_items.append(_ItemReplacements(
+                        content_type=CanvasContentType.ASSIGNMENTS,
+                        content_id=str(assignment['id']),
+                        content_title=assignment.get('name', 'Untitled Assignment'),
+                        content_url=assignment.get('html_url', ''),
+                        location=f"assignment '{assignment.get('name', 'Untitled')}'",
+                        replacements=replacements,
+                        additional_data={
+                            "assignment_id": assignment['id']
+                        }
+                    ))
+                
+        except Exception as e:
+            logger.warning(f"Error processing assignment {assignment.get('id', 'unknown')}: {e}")
+        
+        return replaced_items
+    
+    async def _process_items(
+        self,
+        items: List[Dict[str, Any]],
+        process_item: Callable[[Dict[str, Any]], Awaitable[List[_ItemReplacements]]],
+        progress_tracker: Optional[ProgressTracker],
+        item_label: str
+    ) -> List[_ItemReplacements]:
+        """
+        Run process_item over items concurrently, bounded by the Canvas request limit.
+        
+        process_item is expected to handle its own per-item errors. Results are
+        returned in item order. Progress is only reported when a tracker is given.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        total_items = len(items)
+        processed = 0
+        
+        async def run(item: Dict[str, Any]) -> List[_ItemReplacements]:
+            nonlocal processed
+            async with semaphore:
+                item_results = await process_item(item)
+            
+            # Coalesced - the tracker sends the latest count periodically; the final one is flushed below
+            processed += 1
+            if progress_tracker is not None:
+                progress_tracker.schedule_progress(
+                    ProgressStage.PROCESSING,
+                    processed,
+                    total_items,
+                    f"Processed {processed}/{total_items} {item_label}"
+                )
+            return item_results
+        
+        outcomes = await asyncio.gather(*(run(item) for item in items))
+        if progress_tracker is not None:
+            await progress_tracker.flush_progress()
+        
+        replaced_items = []
+        for item_results in outcomes:
+            replaced_items.extend(item_results)
+        return replaced_items
+    
+    async def _flush_updates(
+        self,
+        pending_updates: Dict[Any, str],
+        apply_update: Callable[[Any, str], Awaitable[bool]],
+        replaced_items: List[_ItemReplacements],
+        key_field: str
+    ):
+        """
+        Send buffered content updates concurrently and record the outcome on each item.
+        
+        Updates are keyed by content ID, so each item is written at most once.
+        Each item's additional_data[key_field] identifies its update.
+        """
+        if not pending_updates:
+            return
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async def send(content_id: Any, new_content: str) -> bool:
+            async with semaphore:
+                try:
+                    return await apply_update(content_id, new_content)
+                except Exception as e:
+                    logger.warning(f"Error updating {key_field} {content_id}: {e}")
+                    return False
+        
+        outcomes = await asyncio.gather(
+            *(send(content_id, new_content) for content_id, new_content in pending_updates.items())
+        )
+        update_results = dict(zip(pending_updates, outcomes, strict=True))
+        
+        for item in replaced_items:
+            item.update_success = update_results.get(item.additional_data[key_field], False)
     
     # Similar methods for quizzes, discussions, announcements, modules...
-    async def _process_quizzes(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_quizzes(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker]) -> List[_ItemReplacements]:
         """Process quiz content - placeholder for now"""
         # TODO: Implement quiz processing similar to assignments
         return []
     
-    async def _process_discussions(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_discussions(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker]) -> List[_ItemReplacements]:
         """Process discussion content - placeholder for now"""
         # TODO: Implement discussion processing 
         return []
     
-    async def _process_announcements(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_announcements(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker]) -> List[_ItemReplacements]:
         """Process announcement content - placeholder for now"""
         # TODO: Implement announcement processing
         return []
     
-    async def _process_modules(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: ProgressTracker) -> List[QAFinding]:
+    async def _process_modules(self, canvas_service, config: FindReplaceConfig, course_info: Dict[str, Any], progress_tracker: Optional[ProgressTracker]) -> List[_ItemReplacements]:
         """Process module content - placeholder for now"""
         # TODO: Implement module processing
         return []
     
-    async def _scan_and_replace_content(self, content: str, config: FindReplaceConfig) -> tuple[str, List[tuple[str, str]]]:
+    async def _scan_and_replace_content(
+        self,
+        content: str,
+        config: FindReplaceConfig,
+        url_replacer: Optional[URLReplacer] = None
+    ) -> tuple[str, List[tuple[str, str]]]:
         """
         Scan content for URLs and replace them.
         
-        This will use the adapted CanvasURLScanner utility.
-        For now, providing a placeholder.
+        Args:
+            content: HTML content to scan
+            config: Task configuration with URL mappings
+            url_replacer: Mappings compiled once per execution (compiled on demand if omitted)
         """
-        # TODO: Use the canvas scanner utility
-        from qa_framework.utils.canvas_scanner import replace_urls_in_content
-        return await replace_urls_in_content(content, config.url_mappings, config)
+        return await replace_urls_in_content(content, config.url_mappings, config, url_replacer)
     
     def _is_valid_url(self, url: str) -> bool:
         """Basic URL validation"""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except:
-            return False 
\ No newline at end of file
+        # Fast path for plain http(s) URLs: valid iff a host follows the scheme
+        # (brackets and control characters still need urlparse's handling)
+        if (url.startswith(('https://', 'http://')) and url.isprintable()
+                and '[' not in url and ']' not in url):
+            host_start = url[8:9] if url[4] == 's' else url[7:8]
+            return bool(host_start) and host_start not in '/?#'
+        return _is_valid_url_cached(url)
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_url_cached(url: str) -> bool:
+    """Parse a URL once and remember whether it has a scheme and host"""
+    from urllib.parse import urlparse
+    
+    try:
+        result = urlparse(url)
+        return bool(result.scheme and result.netloc)
+    except (TypeError, ValueError):
+        return False
+ 
\ No newline at end of file
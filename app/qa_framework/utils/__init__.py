@@ -29,10 +29,12 @@ from .error_handler import (
 )
 
 from .canvas_scanner import (
+    URLReplacer,
     replace_urls_in_content,
     extract_urls_from_content,
     validate_html_content,
-    sanitize_content_for_canvas
+    sanitize_content_for_canvas,
+    process_content
 )
 
 __all__ = [
@@ -58,8 +60,10 @@ __all__ = [
     "create_qa_task_error",
     
     # Canvas scanner utilities
+    "URLReplacer",
     "replace_urls_in_content",
     "extract_urls_from_content", 
     "validate_html_content",
-    "sanitize_content_for_canvas"
+    "sanitize_content_for_canvas",
+    "process_content"
 ] 
\ No newline at end of file
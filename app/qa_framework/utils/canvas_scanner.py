@@ -5,20 +5,411 @@ Adapted from the original CanvasURLScanner script for use with the QA framework.
 Provides HTML parsing and URL replacement functionality using BeautifulSoup.
 """
 
+import html
 import logging
 import re
-from typing import Dict, List, Tuple, Optional
-from bs4 import BeautifulSoup
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Optional
+from bs4 import BeautifulSoup, Tag
 
 from qa_framework.base.data_models import FindReplaceConfig
 
+try:
+    # RE2 (google-re2) matches in linear time regardless of mapping count or body
+    # size; re is the fallback if it isn't installed
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Optional: Aho-Corasick automaton for the prefilter and multi-mapping replacement
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Optional: lxml's C parser for read-only scans and rewriting fragments.
+    # BeautifulSoup's lxml builder wraps fragments in <html><body>, so content
+    # that is written back is otherwise parsed with html.parser
+    from lxml import etree as lxml_etree, html as lxml_html
+    _SCAN_PARSER = 'lxml'
+except ImportError:
+    lxml_etree = lxml_html = None
+    _SCAN_PARSER = 'html.parser'
+
 logger = logging.getLogger(__name__)
 
+# Attributes that may hold a URL (src/poster for media, data-api-endpoint for
+# Canvas); replace_urls_in_content only rewrites href on links
+_URL_ATTRIBUTES = ('src', 'data-api-endpoint', 'action', 'formaction', 'poster', 'background')
+_ALL_URL_ATTRIBUTES = ('href',) + _URL_ATTRIBUTES
+
+# Absolute URLs in plain text
+_TEXT_URL_PATTERN = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Markup that lxml's fragment parser drops or mangles without logging an error:
+# document structure, XML declarations and processing instructions, CDATA
+# sections, and elements libxml2 reads as raw text but serializes escaped
+_NON_FRAGMENT_MARKUP = re.compile(
+    r'<(?:!doctype|html|head|body|\?|!\[CDATA\['
+    r'|iframe|textarea|noembed|noframes|xmp|plaintext)',
+    re.IGNORECASE
+)
+
+# Attributes libxml2 percent-escapes and trims when serializing HTML
+_URI_ATTRIBUTES = ('href', 'src', 'action')
+_LINK_URI_ATTRIBUTES = _URI_ATTRIBUTES + ('name',)
+_URI_ATTRIBUTE_VALUES = lxml_etree.XPath(
+    'descendant-or-self::*/@href | descendant-or-self::*/@src'
+    ' | descendant-or-self::*/@action | descendant-or-self::a/@name'
+) if lxml_etree is not None else None
+
+# Content length above which the lxml path skips top-level subtrees without a mapped URL
+_PRUNE_MIN_LENGTH = 50_000
+
+# Event handler attributes and CSS constructs sanitize_content_for_canvas removes
+_DANGEROUS_ATTRIBUTES = ('onload', 'onerror', 'onclick', 'onmouseover', 'onmouseout')
+_DANGEROUS_CSS_PATTERN = re.compile(r'javascript:|expression\(|@import', re.IGNORECASE)
+
+# Elements whose text is code, not content
+_SKIP_TEXT_PARENTS = frozenset({'script', 'style'})
+
+
+class URLReplacer:
+    """
+    URL mappings compiled into a single alternation pattern.
+    
+    Built once per task execution and reused for every content item, so each
+    value is scanned once for all mappings instead of once per mapping.
+    Call replace(value) to get (new_value, mappings applied, each listed once).
+    """
+    
+    def __init__(self, url_mappings: List[Dict[str, str]], config: FindReplaceConfig):
+        # Longest first so overlapping URLs prefer the most specific mapping; a tuple,
+        # since replacers are shared (see for_config)
+        self.mappings: Tuple[Tuple[str, str], ...] = tuple(sorted(
+            {mapping['find']: mapping['replace'] for mapping in url_mappings if mapping.get('find')}.items(),
+            key=lambda mapping: len(mapping[0]),
+            reverse=True
+        ))
+        
+        # Case-sensitive substring matching can use str.replace directly, provided a
+        # chain of replaces can't rewrite text another mapping produced or overlaps
+        self._literal = (
+            config.case_sensitive
+            and not config.whole_word_only
+            and _can_replace_literally(self.mappings)
+        )
+        
+        # Needles for the may_match() prefilter; None when it can't be used safely
+        self._case_sensitive = config.case_sensitive
+        self._whole_word_only = config.whole_word_only
+        self._needles: Optional[List[str]] = None
+        self._automaton = None
+        if config.case_sensitive:
+            self._needles = [target_url for target_url, _ in self.mappings]
+        elif all(target_url.isascii() for target_url, _ in self.mappings):
+            # casefold() of ASCII equals what IGNORECASE matches, except dotless i (see may_match)
+            self._needles = [target_url.casefold() for target_url, _ in self.mappings]
+        if self._needles and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for index, needle in enumerate(self._needles):
+                # Keep the first of needles that fold together, as the alternation would
+                if not self._automaton.exists(needle):
+                    self._automaton.add_word(needle, (index, len(needle)))
+            self._automaton.make_automaton()
+        
+        self.pattern = None
+        if self.mappings and not self._literal:
+            # No capturing groups: with one per mapping both re and RE2 fall off their
+            # fast paths, so replace() looks the mapping up by the matched text instead
+            alternation = '|'.join(re.escape(target_url) for target_url, _ in self.mappings)
+            if config.whole_word_only:
+                alternation = rf'\b(?:{alternation})\b'
+            if not config.case_sensitive:
+                # Inline flag so the pattern compiles the same way under re and re2
+                alternation = '(?i)' + alternation
+            self.pattern = _compile_pattern(alternation)
+        
+        # replace(value) -> (new_value, mappings applied, each listed once)
+        self.replace = self._specialize_replace()
+    
+    @classmethod
+    def for_config(cls, url_mappings: List[Dict[str, str]], config: FindReplaceConfig) -> 'URLReplacer':
+        """
+        Get a replacer for these mappings and options, shared with earlier callers.
+        
+        Bulk runs reuse one mapping set across many pages and executions, so the
+        compiled pattern and automaton are built once. Replacers hold no
+        per-call state, which makes sharing them safe.
+        """
+        mappings = tuple(
+            (mapping['find'], mapping['replace']) for mapping in url_mappings if mapping.get('find')
+        )
+        return _shared_url_replacer(mappings, bool(config.case_sensitive), bool(config.whole_word_only))
+    
+    def may_match(self, content: str) -> bool:
+        """
+        Cheap check, run before parsing, for whether content can contain a mapped URL.
+        
+        A False result guarantees replace() would change nothing in content's
+        attributes or text, so HTML parsing can be skipped entirely.
+        """
+        if not self.mappings:
+            return False
+        if self._needles is None:
+            return True
+        
+        haystack = self._haystack(content)
+        if self._automaton is not None:
+            return next(self._automaton.iter(haystack), None) is not None
+        return any(needle in haystack for needle in self._needles)
+    
+    def for_content(self, content: str) -> Optional['URLReplacer']:
+        """
+        Narrow this replacer to the mappings whose find URL occurs in content.
+        
+        Returns None when none occur (see may_match), self when all may, and
+        otherwise the shared replacer for just those mappings - usually one or
+        two of a long list, which also gets the single-mapping fast paths.
+        """
+        if not self.mappings:
+            return None
+        if self._needles is None:
+            return self
+        
+        haystack = self._haystack(content)
+        if self._automaton is not None:
+            present = set()
+            needle_count = len(self._automaton)
+            for _, (index, _) in self._automaton.iter(haystack):
+                present.add(index)
+                if len(present) == needle_count:
+                    break
+        else:
+            present = {index for index, needle in enumerate(self._needles) if needle in haystack}
+        
+        if not present:
+            return None
+        if len(present) == len(self.mappings):
+            return self
+        return _shared_url_replacer(
+            tuple(mapping for index, mapping in enumerate(self.mappings) if index in present),
+            self._case_sensitive,
+            self._whole_word_only
+        )
+    
+    def _haystack(self, content: str) -> str:
+        """Content in the form the needles are matched against"""
+        # BeautifulSoup hands replace() entity-decoded values, so match against those
+        haystack = html.unescape(content) if '&' in content else content
+        if not self._case_sensitive:
+            haystack = haystack.casefold()
+            if '\u0131' in haystack:
+                # Dotless i matches 'i' under IGNORECASE but survives casefold()
+                haystack = haystack.replace('\u0131', 'i')
+        return haystack
+    
+    def _specialize_replace(self) -> Callable[[str], Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Build the replace() implementation for this mapping set.
+        
+        Configuration branches are resolved here once, not per value, and the
+        single-mapping case (the usual migration) runs without per-match
+        Python callbacks. Several mappings are matched in one Aho-Corasick pass
+        when the automaton is available and whole-word matching is off.
+        """
+        mappings = self.mappings
+        
+        if not mappings:
+            return lambda value: (value, [])
+        
+        if self._literal:
+            if len(mappings) == 1:
+                mapping = mappings[0]
+                target_url, replacement_url = mapping
+                
+                def replace_single_literal(value: str) -> Tuple[str, List[Tuple[str, str]]]:
+                    if not value or target_url not in value:
+                        return value, []
+                    new_value = value.replace(target_url, replacement_url)
+                    return (new_value, [mapping]) if new_value != value else (value, [])
+                return replace_single_literal
+            
+            # Unpacked once so the loop below does no per-value indexing
+            literal_steps = tuple((mapping[0], mapping[1], mapping) for mapping in mappings)
+            
+            def replace_literal(value: str) -> Tuple[str, List[Tuple[str, str]]]:
+                if not value:
+                    return value, []
+                new_value = value
+                applied = []
+                for target_url, replacement_url, mapping in literal_steps:
+                    if target_url in new_value:
+                        new_value = new_value.replace(target_url, replacement_url)
+                        applied.append(mapping)
+                return (new_value, applied) if new_value != value else (value, [])
+            return replace_literal
+        
+        if len(mappings) == 1:
+            mapping = mappings[0]
+            subn = self.pattern.subn
+            # Literal replacement template (backslashes escaped), so no callback is needed
+            template = mapping[1].replace('\\', '\\\\')
+            
+            def replace_single_pattern(value: str) -> Tuple[str, List[Tuple[str, str]]]:
+                if not value:
+                    return value, []
+                new_value, count = subn(template, value)
+                return (new_value, [mapping]) if count and new_value != value else (value, [])
+            return replace_single_pattern
+        
+        sub = self.pattern.sub
+        
+        # Matched text -> mapping, the first that matches it as in the alternation
+        if self._case_sensitive:
+            mapping_for = dict((mapping[0], mapping) for mapping in mappings).__getitem__
+        else:
+            lookup = {}
+            for mapping in mappings:
+                lookup.setdefault(mapping[0].lower(), mapping)
+            ascii_finds = all(target_url.isascii() for target_url, _ in mappings)
+            
+            def mapping_for(text: str) -> Tuple[str, str]:
+                # Between ASCII strings IGNORECASE equality is exactly lower() equality;
+                # otherwise (e.g. 'ſ' matching 's') find the mapping the way the pattern did
+                if ascii_finds and text.isascii():
+                    return lookup[text.lower()]
+                return next(
+                    mapping for mapping in mappings
+                    if _compile_pattern('(?i)' + re.escape(mapping[0])).fullmatch(text)
+                )
+        
+        def replace_pattern(value: str) -> Tuple[str, List[Tuple[str, str]]]:
+            if not value:
+                return value, []
+            applied = []
+            
+            def substitute(match) -> str:
+                mapping = mapping_for(match.group(0))
+                if mapping not in applied:
+                    applied.append(mapping)
+                return mapping[1]
+            
+            new_value = sub(substitute, value)
+            return (new_value, applied) if new_value != value else (value, [])
+        
+        if self._automaton is None or self._whole_word_only:
+            return replace_pattern
+        
+        automaton_iter = self._automaton.iter
+        case_sensitive = self._case_sensitive
+        
+        def replace_scan(value: str) -> Tuple[str, List[Tuple[str, str]]]:
+            if not value:
+                return value, []
+            if case_sensitive:
+                haystack = value
+            elif value.isascii():
+                # ASCII lower() keeps offsets and folds exactly what IGNORECASE matches
+                haystack = value.lower()
+            else:
+                return replace_pattern(value)
+            
+            # One automaton pass finds every mapping; sort so the leftmost match wins
+            # and the longest find wins at the same start, as in the alternation
+            matches = sorted(
+                (end - length + 1, -length, index)
+                for end, (index, length) in automaton_iter(haystack)
+            )
+            if not matches:
+                return value, []
+            
+            parts = []
+            applied = []
+            position = 0
+            for start, negative_length, index in matches:
+                if start < position:
+                    continue
+                mapping = mappings[index]
+                parts.append(value[position:start])
+                parts.append(mapping[1])
+                position = start - negative_length
+                if mapping not in applied:
+                    applied.append(mapping)
+            parts.append(value[position:])
+            
+            new_value = ''.join(parts)
+            return (new_value, applied) if new_value != value else (value, [])
+        return replace_scan
+
+
+class _ReplacerOptions(NamedTuple):
+    """The FindReplaceConfig fields URLReplacer reads (the config itself isn't hashable)"""
+    case_sensitive: bool
+    whole_word_only: bool
+
+
+@lru_cache(maxsize=128)
+def _shared_url_replacer(
+    mappings: Tuple[Tuple[str, str], ...],
+    case_sensitive: bool,
+    whole_word_only: bool
+) -> URLReplacer:
+    """Build the URLReplacer behind URLReplacer.for_config(), cached per mapping set"""
+    return URLReplacer(
+        [{'find': target_url, 'replace': replacement_url} for target_url, replacement_url in mappings],
+        _ReplacerOptions(case_sensitive, whole_word_only)
+    )
+
+
+def _can_replace_literally(mappings: Tuple[Tuple[str, str], ...]) -> bool:
+    """
+    Check whether applying mappings one after another with str.replace gives the
+    same result as a single alternation pass.
+    
+    That holds when no find URL overlaps another find URL, or the replacement
+    of a different mapping, since neither an earlier replacement nor a partial
+    match can then create or hide a later match.
+    """
+    def overlaps(a: str, b: str) -> bool:
+        if a in b or b in a:
+            return True
+        shortest = min(len(a), len(b))
+        return any(a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, shortest))
+    
+    for i, (target_url, _) in enumerate(mappings):
+        for j, (other_url, other_replacement) in enumerate(mappings):
+            if i == j:
+                continue
+            if (j > i and overlaps(target_url, other_url)) or overlaps(target_url, other_replacement):
+                return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _compile_pattern(pattern: str):
+    """
+    Compile with RE2 when available, falling back to re for patterns RE2 rejects.
+    
+    Cached by pattern, so replacers built for the same mappings and options
+    (e.g. one per task execution) share the compiled object; RE2 keeps no
+    compile cache of its own.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception as e:
+            logger.debug("RE2 could not compile URL pattern, using re: %s", e)
+    return re.compile(pattern)
+
 
 async def replace_urls_in_content(
     content: str, 
     url_mappings: List[Dict[str, str]], 
-    config: FindReplaceConfig
+    config: FindReplaceConfig,
+    url_replacer: Optional[URLReplacer] = None
 ) -> Tuple[str, List[Tuple[str, str]]]:
     """
     Replace multiple target URLs with their replacements in content using BeautifulSoup.
@@ -27,6 +418,8 @@ async def replace_urls_in_content(
         content: HTML content to process
         url_mappings: List of URL mapping dictionaries with 'find' and 'replace' keys
         config: Task configuration for replacement options
+        url_replacer: Pre-compiled mappings to reuse across calls (the shared
+            replacer for url_mappings if not given)
         
     Returns:
         Tuple of (modified_content, list_of_replacements)
@@ -38,179 +431,202 @@ async def replace_urls_in_content(
     replacements = []
     
     try:
-        # Convert url_mappings to dictionary for easier processing
-        url_map = {mapping['find']: mapping['replace'] for mapping in url_mappings}
+        if url_replacer is None:
+            url_replacer = URLReplacer.for_config(url_mappings, config)
         
-        soup = BeautifulSoup(content, 'html.parser')
+        # Most content contains none of the mapped URLs - skip parsing it entirely -
+        # and the rest usually only a few, so match just those
+        url_replacer = url_replacer.for_content(content)
+        if url_replacer is None:
+            return content, []
         
-        # Find and replace URLs in href attributes
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            original_href = href
-            
-            for target_url, replacement_url in url_map.items():
-                if _should_replace_url(href, target_url, config):
-                    logger.info(f"Found target URL in href: {href}")
-                    
-                    if config.whole_word_only:
-                        # Use word boundary matching
-                        pattern = r'\b' + re.escape(target_url) + r'\b'
-                        flags = 0 if config.case_sensitive else re.IGNORECASE
-                        new_href = re.sub(pattern, replacement_url, href, flags=flags)
-                    else:
-                        # Simple string replacement
-                        if config.case_sensitive:
-                            new_href = href.replace(target_url, replacement_url)
-                        else:
-                            # Case-insensitive replacement
-                            pattern = re.escape(target_url)
-                            new_href = re.sub(pattern, replacement_url, href, flags=re.IGNORECASE)
-                    
-                    if new_href != href:
-                        link['href'] = new_href
-                        replacements.append((target_url, replacement_url))
-                        href = new_href  # Update for potential multiple replacements
-        
-        # Find and replace URLs in src attributes (images, videos, etc.)
-        for element in soup.find_all(attrs={"src": True}):
-            src = element['src']
-            original_src = src
-            
-            for target_url, replacement_url in url_map.items():
-                if _should_replace_url(src, target_url, config):
-                    logger.info(f"Found target URL in src: {src}")
-                    
-                    if config.whole_word_only:
-                        pattern = r'\b' + re.escape(target_url) + r'\b'
-                        flags = 0 if config.case_sensitive else re.IGNORECASE
-                        new_src = re.sub(pattern, replacement_url, src, flags=flags)
-                    else:
-                        if config.case_sensitive:
-                            new_src = src.replace(target_url, replacement_url)
-                        else:
-                            pattern = re.escape(target_url)
-                            new_src = re.sub(pattern, replacement_url, src, flags=re.IGNORECASE)
-                    
-                    if new_src != src:
-                        element['src'] = new_src
-                        replacements.append((target_url, replacement_url))
-                        src = new_src
-        
-        # Find and replace URLs in data-api-endpoint attributes (Canvas-specific)
-        for element in soup.find_all(attrs={"data-api-endpoint": True}):
-            endpoint = element['data-api-endpoint']
-            original_endpoint = endpoint
-            
-            for target_url, replacement_url in url_map.items():
-                if _should_replace_url(endpoint, target_url, config):
-                    logger.info(f"Found target URL in data-api-endpoint: {endpoint}")
-                    
-                    if config.whole_word_only:
-                        pattern = r'\b' + re.escape(target_url) + r'\b'
-                        flags = 0 if config.case_sensitive else re.IGNORECASE
-                        new_endpoint = re.sub(pattern, replacement_url, endpoint, flags=flags)
-                    else:
-                        if config.case_sensitive:
-                            new_endpoint = endpoint.replace(target_url, replacement_url)
-                        else:
-                            pattern = re.escape(target_url)
-                            new_endpoint = re.sub(pattern, replacement_url, endpoint, flags=re.IGNORECASE)
-                    
-                    if new_endpoint != endpoint:
-                        element['data-api-endpoint'] = new_endpoint
-                        replacements.append((target_url, replacement_url))
-                        endpoint = new_endpoint
-        
-        # Find and replace URLs in other common attributes
-        common_url_attributes = ['action', 'formaction', 'poster', 'background']
-        for attr in common_url_attributes:
-            for element in soup.find_all(attrs={attr: True}):
-                attr_value = element[attr]
-                original_value = attr_value
-                
-                for target_url, replacement_url in url_map.items():
-                    if _should_replace_url(attr_value, target_url, config):
-                        logger.info(f"Found target URL in {attr}: {attr_value}")
-                        
-                        if config.whole_word_only:
-                            pattern = r'\b' + re.escape(target_url) + r'\b'
-                            flags = 0 if config.case_sensitive else re.IGNORECASE
-                            new_value = re.sub(pattern, replacement_url, attr_value, flags=flags)
-                        else:
-                            if config.case_sensitive:
-                                new_value = attr_value.replace(target_url, replacement_url)
-                            else:
-                                pattern = re.escape(target_url)
-                                new_value = re.sub(pattern, replacement_url, attr_value, flags=re.IGNORECASE)
-                        
-                        if new_value != attr_value:
-                            element[attr] = new_value
-                            replacements.append((target_url, replacement_url))
-                            attr_value = new_value
-        
-        # Also check for URLs in plain text nodes (if include_html_attributes is True)
-        if config.include_html_attributes:
-            text_nodes = soup.find_all(string=True)
-            for text_node in text_nodes:
-                # Skip script and style tags
-                if text_node.parent.name not in ['script', 'style']:
-                    original_text = str(text_node)
-                    new_text = original_text
-                    
-                    for target_url, replacement_url in url_map.items():
-                        if _should_replace_url(new_text, target_url, config):
-                            logger.info(f"Found target URL in text: {text_node}")
-                            
-                            if config.whole_word_only:
-                                pattern = r'\b' + re.escape(target_url) + r'\b'
-                                flags = 0 if config.case_sensitive else re.IGNORECASE
-                                replaced_text = re.sub(pattern, replacement_url, new_text, flags=flags)
-                            else:
-                                if config.case_sensitive:
-                                    replaced_text = new_text.replace(target_url, replacement_url)
-                                else:
-                                    pattern = re.escape(target_url)
-                                    replaced_text = re.sub(pattern, replacement_url, new_text, flags=re.IGNORECASE)
-                            
-                            if replaced_text != new_text:
-                                replacements.append((target_url, replacement_url))
-                                new_text = replaced_text
-                    
-                    # Replace the text node if it was modified
-                    if new_text != original_text:
-                        text_node.replace_with(new_text)
-
-        new_content = str(soup)
+        # Well-formed fragments are rewritten with lxml directly; anything it
+        # wouldn't reproduce faithfully goes through BeautifulSoup
+        # Values changed per attribute name (or 'text'), logged once below
+        changed_values = Counter()
+        new_content = _replace_urls_with_lxml(
+            content, url_replacer, config.include_html_attributes, replacements, changed_values
+        )
+        if new_content is None:
+            soup = _parse_html(content)
+            _replace_urls_in_soup(
+                soup, url_replacer, config.include_html_attributes, replacements, changed_values
+            )
+            new_content = str(soup)
         
         if replacements:
-            logger.info(f"Made {len(replacements)} replacements in content")
+            logger.info("Made %d replacements in content: %s", len(replacements), dict(changed_values))
         
         return new_content, replacements
 
     except Exception as e:
-        logger.error(f"Error during URL replacement: {str(e)}")
+        logger.error("Error during URL replacement: %s", e)
         return content, []
 
 
-def _should_replace_url(content: str, target_url: str, config: FindReplaceConfig) -> bool:
+def _replace_urls_in_soup(
+    soup: BeautifulSoup,
+    url_replacer: URLReplacer,
+    rewrite_text: bool,
+    replacements: List[Tuple[str, str]],
+    changed_values: Counter
+) -> None:
     """
-    Determine if a URL should be replaced based on configuration.
+    Replace URLs in a parsed tree in place, appending applied mappings to replacements.
     
-    Args:
-        content: Content to check
-        target_url: URL to search for
-        config: Replacement configuration
+    URL-bearing attributes and, if rewrite_text is True, plain text nodes are
+    handled in a single tree walk; changed_values counts rewritten values by
+    attribute name ('text' for text nodes).
+    """
+    # The replacer's closure is specialized for its configuration; bind it once for the walk
+    replace = url_replacer.replace
+    text_updates = []
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            attrs = node.attrs
+            if not attrs:
+                continue
+            for attr in (_ALL_URL_ATTRIBUTES if node.name == 'a' else _URL_ATTRIBUTES):
+                attr_value = attrs.get(attr)
+                if attr_value is None:
+                    continue
+                new_value, applied = replace(attr_value)
+                
+                if applied:
+                    changed_values[attr] += 1
+                    attrs[attr] = new_value
+                    replacements.extend(applied)
         
-    Returns:
-        True if URL should be replaced
+        # Skip script and style tags
+        elif rewrite_text and node.parent.name not in _SKIP_TEXT_PARENTS:
+            new_text, applied = replace(str(node))
+            
+            if applied:
+                changed_values['text'] += 1
+                replacements.extend(applied)
+                text_updates.append((node, new_text))
+    
+    # Replace modified text nodes once the walk no longer depends on them, keeping
+    # their type so comments stay comments
+    for text_node, new_text in text_updates:
+        text_node.replace_with(type(text_node)(new_text))
+
+
+def _replace_urls_with_lxml(
+    content: str,
+    url_replacer: URLReplacer,
+    rewrite_text: bool,
+    replacements: List[Tuple[str, str]],
+    changed_values: Counter
+) -> Optional[str]:
+    """
+    Replace URLs in an HTML fragment with lxml, without BeautifulSoup's object layer.
+    
+    Records into replacements and changed_values like _replace_urls_in_soup.
+    Returns the new content, or None when lxml is unavailable or wouldn't
+    round-trip the content: whole documents and XML constructs (which fragment
+    parsing drops), raw text elements such as iframe and textarea (whose
+    content libxml2 escapes on output), NUL characters (which libxml2 strips),
+    markup libxml2 reports errors for (which it restructures) and URI attributes holding
+    whitespace or non-ASCII characters (which libxml2 escapes on output).
     """
-    if not content or not target_url:
-        return False
+    if lxml_html is None or '\x00' in content or _NON_FRAGMENT_MARKUP.search(content):
+        return None
+    
+    parser = lxml_html.HTMLParser()
+    try:
+        fragments = lxml_html.fragments_fromstring(content, parser=parser)
+    except (ValueError, lxml_etree.LxmlError):
+        return None
+    if parser.error_log:
+        return None
+    
+    # Collected here until the whole fragment is known to round-trip
+    fragment_replacements = []
+    fragment_changed_values = Counter()
+    
+    replace = url_replacer.replace
+    
+    def rewrite(location: str, value: str) -> Optional[str]:
+        new_value, applied = replace(value)
+        if not applied:
+            return None
+        fragment_changed_values[location] += 1
+        fragment_replacements.extend(applied)
+        return new_value
+    
+    # Blank text before the first element isn't returned as a fragment; keep
+    # plain whitespace as written and leave anything else (e.g. &nbsp;) to BeautifulSoup
+    leading = content[:content.find('<')] if fragments and not isinstance(fragments[0], str) else ''
+    if leading.strip():
+        return None
+    parts = [leading]
+    prune = len(content) > _PRUNE_MIN_LENGTH and len(fragments) > 1
+    for fragment in fragments:
+        if isinstance(fragment, str):
+            # Text before the first element
+            new_text = rewrite('text', fragment) if rewrite_text else None
+            parts.append(html.escape(fragment if new_text is None else new_text, quote=False))
+            continue
+        
+        if prune:
+            # On large pages, skip walking top-level subtrees whose serialized form
+            # (needed for the output anyway) holds no mapped URL
+            serialized = lxml_html.tostring(fragment, encoding='unicode')
+            if not url_replacer.may_match(serialized):
+                if isinstance(fragment.tag, str) and not all(
+                    _is_serialized_verbatim(value) for value in _URI_ATTRIBUTE_VALUES(fragment)
+                ):
+                    return None
+                parts.append(serialized)
+                fragment.clear()
+                continue
+        
+        # iter() includes comments, whose tag isn't a string
+        for element in fragment.iter():
+            tag = element.tag
+            if isinstance(tag, str) and element.attrib:
+                attrib = element.attrib
+                for attr in (_ALL_URL_ATTRIBUTES if tag == 'a' else _URL_ATTRIBUTES):
+                    attr_value = attrib.get(attr)
+                    if attr_value is not None:
+                        new_value = rewrite(attr, attr_value)
+                        if new_value is not None:
+                            attrib[attr] = new_value
+                
+                for attr in (_LINK_URI_ATTRIBUTES if tag == 'a' else _URI_ATTRIBUTES):
+                    attr_value = attrib.get(attr)
+                    if attr_value is not None and not _is_serialized_verbatim(attr_value):
+                        return None
+            
+            if rewrite_text:
+                # Skip script and style text; a tail belongs to the parent
+                if element.text and tag not in _SKIP_TEXT_PARENTS:
+                    new_text = rewrite('text', element.text)
+                    if new_text is not None:
+                        element.text = new_text
+                if element.tail:
+                    new_tail = rewrite('text', element.tail)
+                    if new_tail is not None:
+                        element.tail = new_tail
+        
+        parts.append(lxml_html.tostring(fragment, encoding='unicode'))
+        # Free the subtree (and its tail) now it's written out, so the whole
+        # tree and the whole output aren't held at once on large pages
+        fragment.clear()
     
-    if config.case_sensitive:
-        return target_url in content
-    else:
-        return target_url.lower() in content.lower()
+    replacements.extend(fragment_replacements)
+    changed_values.update(fragment_changed_values)
+    return ''.join(parts)
+
+
+def _is_serialized_verbatim(uri_attribute_value: str) -> bool:
+    """Whether libxml2 writes a URI attribute value out unchanged (no escaping or trimming)"""
+    return (
+        uri_attribute_value.isascii()
+        and uri_attribute_value.isprintable()
+        and ' ' not in uri_attribute_value
+    )
 
 
 def extract_urls_from_content(content: str) -> List[str]:
@@ -229,25 +645,25 @@ def extract_urls_from_content(content: str) -> List[str]:
     urls = set()
     
     try:
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, _SCAN_PARSER)
         
-        # Extract URLs from common attributes
-        url_attributes = ['href', 'src', 'action', 'formaction', 'poster', 'background', 'data-api-endpoint']
-        
-        for attr in url_attributes:
-            for element in soup.find_all(attrs={attr: True}):
-                url = element[attr]
+        # Extract URLs from common attributes, in a single tree walk
+        for element in soup.find_all(True):
+            attrs = element.attrs
+            if not attrs:
+                continue
+            for attr in _ALL_URL_ATTRIBUTES:
+                url = attrs.get(attr)
                 if url and url.startswith(('http://', 'https://', '//')):
                     urls.add(url)
         
-        # Extract URLs from text using regex
-        text_content = soup.get_text()
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        text_urls = re.findall(url_pattern, text_content)
-        urls.update(text_urls)
+        # Extract URLs from text node by node, skipping nodes that cannot hold one
+        for text in soup.strings:
+            if 'http' in text:
+                urls.update(_TEXT_URL_PATTERN.findall(text))
         
     except Exception as e:
-        logger.error(f"Error extracting URLs from content: {e}")
+        logger.error("Error extracting URLs from content: %s", e)
     
     return list(urls)
 
@@ -270,49 +686,7 @@ def validate_html_content(content: str) -> Dict[str, any]:
         }
     
     try:
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Count different types of elements
-        stats = {
-            "total_elements": len(soup.find_all()),
-            "links": len(soup.find_all('a')),
-            "images": len(soup.find_all('img')),
-            "forms": len(soup.find_all('form')),
-            "tables": len(soup.find_all('table')),
-            "lists": len(soup.find_all(['ul', 'ol'])),
-            "headings": len(soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])),
-            "paragraphs": len(soup.find_all('p')),
-            "divs": len(soup.find_all('div')),
-            "spans": len(soup.find_all('span'))
-        }
-        
-        # Check for common issues
-        issues = []
-        
-        # Check for links without href
-        empty_links = soup.find_all('a', href='')
-        if empty_links:
-            issues.append(f"Found {len(empty_links)} links with empty href attributes")
-        
-        # Check for images without alt text
-        images_without_alt = soup.find_all('img', alt='')
-        if images_without_alt:
-            issues.append(f"Found {len(images_without_alt)} images without alt text")
-        
-        # Check for broken HTML structure
-        if not soup.find('html') and (soup.find('head') or soup.find('body')):
-            issues.append("HTML structure may be incomplete (missing html tag)")
-        
-        return {
-            "is_valid": True,
-            "stats": stats,
-            "issues": issues,
-            "content_length": len(content),
-            "text_length": len(soup.get_text()),
-            "has_forms": stats["forms"] > 0,
-            "has_tables": stats["tables"] > 0,
-            "has_media": stats["images"] > 0
-        }
+        return _validate_soup(_parse_html(content), content)
         
     except Exception as e:
         return {
@@ -336,33 +710,154 @@ def sanitize_content_for_canvas(content: str) -> str:
         return content
     
     try:
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Remove potentially problematic elements
-        for script in soup.find_all('script'):
-            script.decompose()
-        
-        for style in soup.find_all('style'):
-            # Keep basic styles but remove potentially problematic ones
-            if style.string and any(danger in style.string.lower() for danger in ['javascript:', '@import', 'expression(']):
-                style.decompose()
-        
-        # Clean up attributes that might cause issues
-        for element in soup.find_all():
-            # Remove potentially dangerous attributes
-            dangerous_attrs = ['onload', 'onerror', 'onclick', 'onmouseover', 'onmouseout']
-            for attr in dangerous_attrs:
-                if element.has_attr(attr):
-                    del element[attr]
-            
-            # Clean up style attributes
-            if element.has_attr('style'):
-                style_value = element['style']
-                if any(danger in style_value.lower() for danger in ['javascript:', 'expression(', '@import']):
-                    del element['style']
-        
+        soup = _parse_html(content)
+        _sanitize_soup(soup)
         return str(soup)
         
     except Exception as e:
-        logger.error(f"Error sanitizing content: {e}")
-        return content 
\ No newline at end of file
+        logger.error("Error sanitizing content: %s", e)
+        return content 
+
+
+async def process_content(
+    content: str,
+    url_mappings: List[Dict[str, str]],
+    config: FindReplaceConfig,
+    url_replacer: Optional[URLReplacer] = None
+) -> Tuple[str, List[Tuple[str, str]], Dict[str, Any]]:
+    """
+    Validate, sanitize and replace URLs in content, parsing it only once.
+    
+    Equivalent to validate_html_content(), sanitize_content_for_canvas() and
+    replace_urls_in_content() in sequence, but the three share one parsed tree
+    and the result is serialized once.
+    
+    Args:
+        content: HTML content to process
+        url_mappings: List of URL mapping dictionaries with 'find' and 'replace' keys
+        config: Task configuration for replacement options
+        url_replacer: Pre-compiled mappings to reuse across calls (the shared
+            replacer for url_mappings if not given)
+        
+    Returns:
+        Tuple of (processed_content, list_of_replacements, validation_result)
+    """
+    if not content:
+        return content, [], validate_html_content(content)
+    
+    try:
+        soup = _parse_html(content)
+        validation = _validate_soup(soup, content)
+        _sanitize_soup(soup)
+        
+        if url_replacer is None:
+            url_replacer = URLReplacer.for_config(url_mappings, config)
+        url_replacer = url_replacer.for_content(content)
+        
+        replacements = []
+        changed_values = Counter()
+        if url_replacer is not None:
+            _replace_urls_in_soup(
+                soup, url_replacer, config.include_html_attributes, replacements, changed_values
+            )
+            if replacements:
+                logger.info("Made %d replacements in content: %s", len(replacements), dict(changed_values))
+        
+        return str(soup), replacements, validation
+        
+    except Exception as e:
+        logger.error("Error processing content: %s", e)
+        return content, [], {
+            "is_valid": False,
+            "error": f"HTML parsing error: {str(e)}",
+            "stats": {}
+        }
+
+
+def _parse_html(content: str) -> BeautifulSoup:
+    """Parse content that will be written back (html.parser keeps fragments as fragments)"""
+    return BeautifulSoup(content, 'html.parser')
+
+
+def _validate_soup(soup: BeautifulSoup, content: str) -> Dict[str, Any]:
+    """Validation results and statistics for a parsed tree (see validate_html_content)"""
+    # Count elements by tag name, and links/images with empty href/alt, in one pass
+    tag_counts = Counter()
+    empty_links = 0
+    images_without_alt = 0
+    for element in soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        tag_counts[element.name] += 1
+        if element.name == 'a':
+            if element.attrs.get('href') == '':
+                empty_links += 1
+        elif element.name == 'img' and element.attrs.get('alt') == '':
+            images_without_alt += 1
+
+    # Count different types of elements
+    stats = {
+        "total_elements": sum(tag_counts.values()),
+        "links": tag_counts['a'],
+        "images": tag_counts['img'],
+        "forms": tag_counts['form'],
+        "tables": tag_counts['table'],
+        "lists": tag_counts['ul'] + tag_counts['ol'],
+        "headings": sum(tag_counts[heading] for heading in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')),
+        "paragraphs": tag_counts['p'],
+        "divs": tag_counts['div'],
+        "spans": tag_counts['span']
+    }
+
+    # Check for common issues
+    issues = []
+
+    # Check for links without href
+    if empty_links:
+        issues.append(f"Found {empty_links} links with empty href attributes")
+
+    # Check for images without alt text
+    if images_without_alt:
+        issues.append(f"Found {images_without_alt} images without alt text")
+
+    # Check for broken HTML structure
+    if not tag_counts['html'] and (tag_counts['head'] or tag_counts['body']):
+        issues.append("HTML structure may be incomplete (missing html tag)")
+
+    return {
+        "is_valid": True,
+        "stats": stats,
+        "issues": issues,
+        "content_length": len(content),
+        "text_length": len(soup.get_text()),
+        "has_forms": stats["forms"] > 0,
+        "has_tables": stats["tables"] > 0,
+        "has_media": stats["images"] > 0
+    }
+
+
+def _sanitize_soup(soup: BeautifulSoup) -> None:
+    """Sanitize a parsed tree in place (see sanitize_content_for_canvas)"""
+    # Remove potentially problematic elements
+    for script in soup.find_all('script'):
+        script.decompose()
+
+    for style in soup.find_all('style'):
+        # Keep basic styles but remove potentially problematic ones
+        if style.string and _DANGEROUS_CSS_PATTERN.search(style.string):
+            style.decompose()
+
+    # Clean up attributes that might cause issues
+    for element in soup.find_all():
+        attrs = element.attrs
+        if not attrs:
+            continue
+
+        # Remove potentially dangerous attributes
+        for attr in _DANGEROUS_ATTRIBUTES:
+            attrs.pop(attr, None)
+
+        # Clean up style attributes
+        style_value = attrs.get('style')
+        if style_value is not None and _DANGEROUS_CSS_PATTERN.search(style_value):
+            del attrs['style']
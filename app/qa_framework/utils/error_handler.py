@@ -8,13 +8,21 @@ including Canvas API error classification, recovery mechanisms, and debugging su
 import logging
 import time
 import traceback
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, Union
-from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Type, Union
+from dataclasses import dataclass, field
 
 from qa_framework.base.qa_task import QATaskError, QATaskExecutionError, QATaskTimeoutError
 
+try:
+    # Optional: Aho-Corasick automaton to find every error pattern in one scan
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +34,23 @@ class ErrorSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+# Severity order; the string values don't sort by severity ("low" > "high")
+_SEVERITY_RANK: Dict[ErrorSeverity, int] = {
+    ErrorSeverity.LOW: 0,
+    ErrorSeverity.MEDIUM: 1,
+    ErrorSeverity.HIGH: 2,
+    ErrorSeverity.CRITICAL: 3
+}
+
+# Log level for errors of each severity
+_SEVERITY_LOG_LEVELS: Dict[ErrorSeverity, int] = {
+    ErrorSeverity.LOW: logging.INFO,
+    ErrorSeverity.MEDIUM: logging.WARNING,
+    ErrorSeverity.HIGH: logging.ERROR,
+    ErrorSeverity.CRITICAL: logging.CRITICAL
+}
+
+
 class ErrorCategory(str, Enum):
     """Error categories for classification"""
     CANVAS_API = "canvas_api"
@@ -47,7 +72,7 @@ class RecoveryStrategy(str, Enum):
     USER_INTERVENTION = "user_intervention"
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorContext:
     """Context information for errors"""
     task_id: str
@@ -58,9 +83,14 @@ class ErrorContext:
     timestamp: datetime
     stage: str
     additional_data: Dict[str, Any]
+    timestamp_iso: str = field(init=False)
+    
+    def __post_init__(self):
+        # Formatted once; statistics report it on every poll
+        self.timestamp_iso = self.timestamp.isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorInfo:
     """Comprehensive error information"""
     error: Exception
@@ -70,10 +100,144 @@ class ErrorInfo:
     context: ErrorContext
     user_message: str
     technical_message: str
-    suggested_actions: List[str]
+    suggested_actions: Sequence[str]
     can_retry: bool = False
     retry_delay_seconds: int = 0
     max_retries: int = 0
+    technical_traceback: Optional[str] = None
+    error_type_name: str = ""
+    
+    def __post_init__(self):
+        if not self.error_type_name:
+            self.error_type_name = type(self.error).__name__
+
+
+@dataclass
+class _ErrorCounts:
+    """
+    Running counts of a set of errors by category, severity and recovery strategy.
+    
+    Keyed by enum member, which is hashed without going through the .value
+    descriptor; values() gives the counts keyed by value, for reporting.
+    """
+    by_category: Counter = field(default_factory=Counter)
+    by_severity: Counter = field(default_factory=Counter)
+    by_recovery_strategy: Counter = field(default_factory=Counter)
+    
+    def add(self, error_info: ErrorInfo):
+        self.by_category[error_info.category] += 1
+        self.by_severity[error_info.severity] += 1
+        self.by_recovery_strategy[error_info.recovery_strategy] += 1
+    
+    def remove(self, error_info: ErrorInfo):
+        for counts, key in (
+            (self.by_category, error_info.category),
+            (self.by_severity, error_info.severity),
+            (self.by_recovery_strategy, error_info.recovery_strategy)
+        ):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+    
+    @property
+    def total(self) -> int:
+        return sum(self.by_category.values())
+    
+    def merged(self, other: "_ErrorCounts") -> "_ErrorCounts":
+        return _ErrorCounts(
+            by_category=self.by_category + other.by_category,
+            by_severity=self.by_severity + other.by_severity,
+            by_recovery_strategy=self.by_recovery_strategy + other.by_recovery_strategy
+        )
+    
+    @staticmethod
+    def values(counts: Counter) -> Dict[str, int]:
+        return {member.value: count for member, count in counts.items()}
+
+
+@dataclass
+class _UnstoredErrorCounts(_ErrorCounts):
+    """
+    Counts of a task's errors kept out of the history.
+    
+    The errors themselves are gone, so this also keeps what the task's error
+    report needs: the worst severity per category and the latest timestamp.
+    """
+    worst_severity_by_category: Dict[ErrorCategory, ErrorSeverity] = field(default_factory=dict)
+    most_recent_timestamp_iso: Optional[str] = None
+    
+    def add(self, error_info: ErrorInfo):
+        super().add(error_info)
+        category = error_info.category
+        worst = self.worst_severity_by_category.get(category)
+        if worst is None or _SEVERITY_RANK[error_info.severity] > _SEVERITY_RANK[worst]:
+            self.worst_severity_by_category[category] = error_info.severity
+        self.most_recent_timestamp_iso = error_info.context.timestamp_iso
+
+
+# Suggested actions by error category; tuples, since every ErrorInfo of a category shares one
+_SUGGESTED_ACTIONS_BY_CATEGORY: Dict[ErrorCategory, Tuple[str, ...]] = {
+    ErrorCategory.AUTHENTICATION: (
+        "Check your Canvas login status",
+        "Verify you have the required permissions",
+        "Contact your Canvas administrator if the issue persists"
+    ),
+    ErrorCategory.RATE_LIMITING: (
+        "The system will automatically retry after a delay",
+        "Consider reducing the scope of your QA task",
+        "Try running the task during off-peak hours"
+    ),
+    ErrorCategory.NETWORK: (
+        "Check your internet connection",
+        "The system will automatically retry",
+        "Contact support if the issue persists"
+    ),
+    ErrorCategory.CANVAS_API: (
+        "Check if the content still exists in Canvas",
+        "Verify the course is accessible",
+        "Contact Canvas support if needed"
+    )
+}
+_DEFAULT_SUGGESTED_ACTIONS: Tuple[str, ...] = (
+    "The system will attempt to recover automatically",
+    "Contact support if the issue persists"
+)
+
+
+# Values for the optional keys of an ERROR_PATTERNS entry
+_ERROR_CONFIG_DEFAULTS: Dict[str, Any] = {
+    "can_retry": False,
+    "retry_delay": 0,
+    "max_retries": 0
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _PatternTemplate:
+    """An error pattern's configuration with enums resolved and defaults filled in"""
+    category: ErrorCategory
+    severity: ErrorSeverity
+    recovery: RecoveryStrategy
+    user_message: str
+    suggested_actions: Tuple[str, ...]
+    can_retry: bool
+    retry_delay: int
+    max_retries: int
+    
+    @classmethod
+    def from_config(cls, error_config: Dict[str, Any]) -> '_PatternTemplate':
+        error_config = {**_ERROR_CONFIG_DEFAULTS, **error_config}
+        category = ErrorCategory(error_config["category"])
+        return cls(
+            category=category,
+            severity=ErrorSeverity(error_config["severity"]),
+            recovery=RecoveryStrategy(error_config["recovery"]),
+            user_message=error_config["user_message"],
+            suggested_actions=_SUGGESTED_ACTIONS_BY_CATEGORY.get(category, _DEFAULT_SUGGESTED_ACTIONS),
+            can_retry=error_config["can_retry"],
+            retry_delay=error_config["retry_delay"],
+            max_retries=error_config["max_retries"]
+        )
 
 
 class CanvasAPIErrorClassifier:
@@ -81,24 +245,13 @@ class CanvasAPIErrorClassifier:
     Classifier for Canvas API errors with recovery strategies.
     """
     
-    # Canvas API error patterns
+    # Leading characters of an error message searched for ERROR_PATTERNS
+    PATTERN_SCAN_LENGTH = 512
+    
+    # Canvas API error patterns, in match priority order: when a message contains
+    # several, the first listed wins. Rate limiting and timeouts dominate long
+    # course scans, so they come first and the fallback scan exits early for them
     ERROR_PATTERNS = {
-        # Authentication errors
-        "unauthorized": {
-            "category": ErrorCategory.AUTHENTICATION,
-            "severity": ErrorSeverity.HIGH,
-            "recovery": RecoveryStrategy.USER_INTERVENTION,
-            "user_message": "Authentication failed. Please check your Canvas access permissions.",
-            "can_retry": False
-        },
-        "forbidden": {
-            "category": ErrorCategory.AUTHENTICATION,
-            "severity": ErrorSeverity.HIGH,
-            "recovery": RecoveryStrategy.USER_INTERVENTION,
-            "user_message": "Access denied. You may not have permission to access this content.",
-            "can_retry": False
-        },
-        
         # Rate limiting errors
         "rate limit": {
             "category": ErrorCategory.RATE_LIMITING,
@@ -120,15 +273,6 @@ class CanvasAPIErrorClassifier:
         },
         
         # Network errors
-        "connection": {
-            "category": ErrorCategory.NETWORK,
-            "severity": ErrorSeverity.MEDIUM,
-            "recovery": RecoveryStrategy.RETRY,
-            "user_message": "Network connection issue. Retrying...",
-            "can_retry": True,
-            "retry_delay": 10,
-            "max_retries": 3
-        },
         "timeout": {
             "category": ErrorCategory.TIMEOUT,
             "severity": ErrorSeverity.MEDIUM,
@@ -138,6 +282,15 @@ class CanvasAPIErrorClassifier:
             "retry_delay": 5,
             "max_retries": 2
         },
+        "connection": {
+            "category": ErrorCategory.NETWORK,
+            "severity": ErrorSeverity.MEDIUM,
+            "recovery": RecoveryStrategy.RETRY,
+            "user_message": "Network connection issue. Retrying...",
+            "can_retry": True,
+            "retry_delay": 10,
+            "max_retries": 3
+        },
         
         # Canvas-specific errors
         "not found": {
@@ -147,6 +300,24 @@ class CanvasAPIErrorClassifier:
             "user_message": "Content not found or may have been deleted.",
             "can_retry": False
         },
+        
+        # Authentication errors
+        "unauthorized": {
+            "category": ErrorCategory.AUTHENTICATION,
+            "severity": ErrorSeverity.HIGH,
+            "recovery": RecoveryStrategy.USER_INTERVENTION,
+            "user_message": "Authentication failed. Please check your Canvas access permissions.",
+            "can_retry": False
+        },
+        "forbidden": {
+            "category": ErrorCategory.AUTHENTICATION,
+            "severity": ErrorSeverity.HIGH,
+            "recovery": RecoveryStrategy.USER_INTERVENTION,
+            "user_message": "Access denied. You may not have permission to access this content.",
+            "can_retry": False
+        },
+        
+        # Configuration errors
         "invalid": {
             "category": ErrorCategory.TASK_CONFIG,
             "severity": ErrorSeverity.HIGH,
@@ -168,76 +339,88 @@ class CanvasAPIErrorClassifier:
         Returns:
             ErrorInfo with classification and recovery strategy
         """
-        error_str = str(error).lower()
-        
-        # Find matching pattern
-        error_config = None
-        for pattern, config in cls.ERROR_PATTERNS.items():
-            if pattern in error_str:
-                error_config = config
-                break
+        message = str(error)
+        error_type_name = type(error).__name__
+        # Patterns are short and appear near the start of Canvas error messages, so
+        # large HTML or JSON bodies appended to an error are not lowercased or scanned
+        error_str = message[:cls.PATTERN_SCAN_LENGTH].lower()
         
-        # Default classification for unknown errors
-        if not error_config:
-            error_config = {
-                "category": ErrorCategory.SYSTEM,
-                "severity": ErrorSeverity.MEDIUM,
-                "recovery": RecoveryStrategy.RETRY,
-                "user_message": "An unexpected error occurred during QA processing.",
-                "can_retry": True,
-                "retry_delay": 5,
-                "max_retries": 1
-            }
+        # Find matching pattern, with the default classification for unknown errors
+        template = cls._match_pattern(error_str) or _DEFAULT_PATTERN_TEMPLATE
         
         # Create ErrorInfo
         return ErrorInfo(
             error=error,
-            category=ErrorCategory(error_config["category"]),
-            severity=ErrorSeverity(error_config["severity"]),
-            recovery_strategy=RecoveryStrategy(error_config["recovery"]),
+            category=template.category,
+            severity=template.severity,
+            recovery_strategy=template.recovery,
             context=context,
-            user_message=error_config["user_message"],
-            technical_message=f"{type(error).__name__}: {str(error)}",
-            suggested_actions=cls._get_suggested_actions(error_config),
-            can_retry=error_config.get("can_retry", False),
-            retry_delay_seconds=error_config.get("retry_delay", 0),
-            max_retries=error_config.get("max_retries", 0)
+            user_message=template.user_message,
+            technical_message=f"{error_type_name}: {message}",
+            suggested_actions=template.suggested_actions,
+            can_retry=template.can_retry,
+            retry_delay_seconds=template.retry_delay,
+            max_retries=template.max_retries,
+            error_type_name=error_type_name
         )
     
     @classmethod
-    def _get_suggested_actions(cls, error_config: Dict[str, Any]) -> List[str]:
-        """Get suggested actions based on error configuration"""
-        category = error_config["category"]
+    def _match_pattern(cls, error_str: str) -> Optional[_PatternTemplate]:
+        """Template of the first pattern (in ERROR_PATTERNS order) found in error_str"""
+        if cls.ERROR_PATTERNS is not CanvasAPIErrorClassifier.ERROR_PATTERNS:
+            # Patterns overridden in a subclass aren't precompiled
+            for pattern, config in cls.ERROR_PATTERNS.items():
+                if pattern in error_str:
+                    return _PatternTemplate.from_config(config)
+            return None
         
-        if category == ErrorCategory.AUTHENTICATION:
-            return [
-                "Check your Canvas login status",
-                "Verify you have the required permissions",
-                "Contact your Canvas administrator if the issue persists"
-            ]
-        elif category == ErrorCategory.RATE_LIMITING:
-            return [
-                "The system will automatically retry after a delay",
-                "Consider reducing the scope of your QA task",
-                "Try running the task during off-peak hours"
-            ]
-        elif category == ErrorCategory.NETWORK:
-            return [
-                "Check your internet connection",
-                "The system will automatically retry",
-                "Contact support if the issue persists"
-            ]
-        elif category == ErrorCategory.CANVAS_API:
-            return [
-                "Check if the content still exists in Canvas",
-                "Verify the course is accessible",
-                "Contact Canvas support if needed"
-            ]
-        else:
-            return [
-                "The system will attempt to recover automatically",
-                "Contact support if the issue persists"
-            ]
+        if _PATTERN_AUTOMATON is not None:
+            # One scan finds every pattern; the earliest-listed one wins, as in the loop below
+            matches = [value for _, value in _PATTERN_AUTOMATON.iter(error_str)]
+            return min(matches, key=lambda value: value[0])[1] if matches else None
+        
+        for pattern, template in _PATTERN_TEMPLATES:
+            if pattern in error_str:
+                return template
+        return None
+
+
+def _build_pattern_automaton(pattern_templates: Tuple[Tuple[str, _PatternTemplate], ...]):
+    """Aho-Corasick automaton over the error patterns, or None without pyahocorasick"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, (pattern, template) in enumerate(pattern_templates):
+        automaton.add_word(pattern, (index, template))
+    automaton.make_automaton()
+    return automaton
+
+
+# Derived from ERROR_PATTERNS, which stays the source of truth
+_PATTERN_TEMPLATES: Tuple[Tuple[str, _PatternTemplate], ...] = tuple(
+    (pattern, _PatternTemplate.from_config(config))
+    for pattern, config in CanvasAPIErrorClassifier.ERROR_PATTERNS.items()
+)
+_PATTERN_AUTOMATON = _build_pattern_automaton(_PATTERN_TEMPLATES)
+
+# Classification for errors matching no pattern
+_DEFAULT_PATTERN_TEMPLATE = _PatternTemplate.from_config({
+    "category": ErrorCategory.SYSTEM,
+    "severity": ErrorSeverity.MEDIUM,
+    "recovery": RecoveryStrategy.RETRY,
+    "user_message": "An unexpected error occurred during QA processing.",
+    "can_retry": True,
+    "retry_delay": 5,
+    "max_retries": 1
+})
+
+
+def _is_actionable_error(error_info: ErrorInfo) -> bool:
+    """Default QAErrorHandler.store_filter: everything but low-severity errors that are skipped"""
+    return not (
+        error_info.severity is ErrorSeverity.LOW
+        and error_info.recovery_strategy is RecoveryStrategy.SKIP
+    )
 
 
 class QAErrorHandler:
@@ -249,11 +432,26 @@ class QAErrorHandler:
     """
     
     def __init__(self):
-        self.error_history: List[ErrorInfo] = []
-        self.retry_counts: Dict[str, int] = {}
+        self.error_history: Deque[ErrorInfo] = deque()
+        # Retry counts by task ID, then error type name
+        self.retry_counts: Dict[str, Dict[str, int]] = defaultdict(dict)
         self.max_history_size = 1000
+        
+        # Running counts over error_history, and a per-task index of it, so
+        # statistics and task lookups don't scan the whole history
+        self._history_counts = _ErrorCounts()
+        self._task_errors: Dict[str, Deque[ErrorInfo]] = defaultdict(deque)
+        self._task_counts: Dict[str, _ErrorCounts] = defaultdict(_ErrorCounts)
+        
+        # Which errors are kept in error_history; the rest (by default, low-severity
+        # errors that are skipped anyway, e.g. bulk 404s) would only push actionable
+        # errors out of it, and are only counted, overall and per task
+        self.store_filter: Callable[[ErrorInfo], bool] = _is_actionable_error
+        self._unstored_counts = _ErrorCounts()
+        self._task_unstored_counts: Dict[str, _UnstoredErrorCounts] = defaultdict(_UnstoredErrorCounts)
+        self._most_recent_timestamp_iso: Optional[str] = None
     
-    async def handle_error(
+    def handle_error(
         self,
         error: Exception,
         context: ErrorContext,
@@ -274,112 +472,157 @@ class QAErrorHandler:
         error_info = CanvasAPIErrorClassifier.classify_error(error, context)
         
         # Log the error
-        await self._log_error(error_info)
-        
-        # Store in history
-        self._store_error_history(error_info)
+        self._log_error(error_info)
         
         # Update retry tracking
         if task_id and error_info.can_retry:
-            retry_key = f"{task_id}:{type(error).__name__}"
-            self.retry_counts[retry_key] = self.retry_counts.get(retry_key, 0) + 1
+            task_retry_counts = self.retry_counts[task_id]
+            error_name = error_info.error_type_name
+            retry_count = task_retry_counts[error_name] = task_retry_counts.get(error_name, 0) + 1
             
             # Check if max retries exceeded
-            if self.retry_counts[retry_key] > error_info.max_retries:
+            if retry_count > error_info.max_retries:
                 error_info.can_retry = False
                 error_info.recovery_strategy = RecoveryStrategy.ABORT
                 error_info.user_message = "Maximum retry attempts exceeded. Please try again later."
         
+        # Store in history (once final, since history keeps running counts)
+        if self.store_filter(error_info):
+            self._store_error_history(error_info)
+        else:
+            self._unstored_counts.add(error_info)
+            self._task_unstored_counts[context.task_id].add(error_info)
+        self._most_recent_timestamp_iso = context.timestamp_iso
+        
         return error_info
     
-    async def _log_error(self, error_info: ErrorInfo):
+    def _log_error(self, error_info: ErrorInfo):
         """Log error with appropriate level"""
-        log_data = {
-            'task_id': error_info.context.task_id,
-            'category': error_info.category.value,
-            'severity': error_info.severity.value,
-            'recovery_strategy': error_info.recovery_strategy.value,
-            'error_type': type(error_info.error).__name__,
-            'course_id': error_info.context.course_id,
-            'user_id': error_info.context.user_id
-        }
+        severity = error_info.severity
+        level = _SEVERITY_LOG_LEVELS.get(severity, logging.INFO)
         
-        if error_info.severity == ErrorSeverity.CRITICAL:
-            logger.critical(error_info.technical_message, extra=log_data)
-        elif error_info.severity == ErrorSeverity.HIGH:
-            logger.error(error_info.technical_message, extra=log_data)
-        elif error_info.severity == ErrorSeverity.MEDIUM:
-            logger.warning(error_info.technical_message, extra=log_data)
-        else:
-            logger.info(error_info.technical_message, extra=log_data)
+        # Build the structured extras only if the record will be emitted
+        if logger.isEnabledFor(level):
+            context = error_info.context
+            log_data = {
+                'task_id': context.task_id,
+                'category': error_info.category.value,
+                'severity': severity.value,
+                'recovery_strategy': error_info.recovery_strategy.value,
+                'error_type': error_info.error_type_name,
+                'course_id': context.course_id,
+                'user_id': context.user_id
+            }
+            logger.log(level, "%s", error_info.technical_message, extra=log_data)
+        
+        # Add stack trace for debugging (not even formatted unless DEBUG is enabled)
+        if (severity is ErrorSeverity.HIGH or severity is ErrorSeverity.CRITICAL) and logger.isEnabledFor(logging.DEBUG):
+            stack_trace = self._format_traceback(error_info)
+            if stack_trace:
+                logger.debug("Stack trace for %s:\n%s", error_info.context.task_id, stack_trace)
+    
+    @staticmethod
+    def _format_traceback(error_info: ErrorInfo) -> str:
+        """
+        The error's own traceback, formatted once and cached on error_info.
         
-        # Add stack trace for debugging
-        if error_info.severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
-            logger.debug(f"Stack trace for {error_info.context.task_id}:\n{traceback.format_exc()}")
+        Uses error.__traceback__ rather than the active exception, which may be
+        gone (or a different one) by the time the error is handled; empty for
+        errors that were never raised.
+        """
+        if error_info.technical_traceback is None:
+            error = error_info.error
+            error_info.technical_traceback = "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            ) if error.__traceback__ is not None else ""
+        return error_info.technical_traceback
     
     def _store_error_history(self, error_info: ErrorInfo):
         """Store error in history with size limit"""
         self.error_history.append(error_info)
+        self._history_counts.add(error_info)
+        task_id = error_info.context.task_id
+        self._task_errors[task_id].append(error_info)
+        self._task_counts[task_id].add(error_info)
         
-        # Limit history size
-        if len(self.error_history) > self.max_history_size:
-            self.error_history = self.error_history[-self.max_history_size:]
+        # Limit history size, evicting the oldest errors one at a time
+        while len(self.error_history) > self.max_history_size:
+            self._forget_evicted_error(self.error_history.popleft())
+    
+    def _forget_evicted_error(self, error_info: ErrorInfo):
+        """Drop an error evicted from history (its task's oldest) from the counts and task index"""
+        self._history_counts.remove(error_info)
+        task_id = error_info.context.task_id
+        task_errors = self._task_errors[task_id]
+        task_errors.popleft()
+        if task_errors:
+            self._task_counts[task_id].remove(error_info)
+        else:
+            del self._task_errors[task_id]
+            del self._task_counts[task_id]
     
     def get_error_statistics(self, task_id: Optional[str] = None) -> Dict[str, Any]:
         """Get error statistics"""
-        errors = self.error_history
+        # Errors kept out of the history still count here
         if task_id:
-            errors = [e for e in errors if e.context.task_id == task_id]
-        
-        if not errors:
-            return {"total_errors": 0}
-        
-        # Count by category
-        category_counts = {}
-        severity_counts = {}
-        recovery_counts = {}
-        
-        for error in errors:
-            category = error.category.value
-            severity = error.severity.value
-            recovery = error.recovery_strategy.value
-            
-            category_counts[category] = category_counts.get(category, 0) + 1
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            recovery_counts[recovery] = recovery_counts.get(recovery, 0) + 1
+            errors = self._task_errors.get(task_id)
+            unstored = self._task_unstored_counts.get(task_id)
+            if not errors and unstored is None:
+                return {"total_errors": 0}
+            if not errors:
+                counts = unstored
+                total_errors = unstored.total
+                most_recent = unstored.most_recent_timestamp_iso
+            else:
+                counts = self._task_counts[task_id]
+                total_errors = len(errors)
+                most_recent = errors[-1].context.timestamp_iso
+                if unstored is not None:
+                    counts = counts.merged(unstored)
+                    total_errors += unstored.total
+                    most_recent = max(most_recent, unstored.most_recent_timestamp_iso)
+        else:
+            unstored = self._unstored_counts
+            total_errors = len(self.error_history) + unstored.total
+            if not total_errors:
+                return {"total_errors": 0}
+            counts = self._history_counts.merged(unstored)
+            most_recent = self._most_recent_timestamp_iso
         
         return {
-            "total_errors": len(errors),
-            "by_category": category_counts,
-            "by_severity": severity_counts,
-            "by_recovery_strategy": recovery_counts,
-            "most_recent": errors[-1].timestamp.isoformat() if errors else None
+            "total_errors": total_errors,
+            "by_category": _ErrorCounts.values(counts.by_category),
+            "by_severity": _ErrorCounts.values(counts.by_severity),
+            "by_recovery_strategy": _ErrorCounts.values(counts.by_recovery_strategy),
+            "most_recent": most_recent
         }
     
     def get_recent_errors(self, task_id: Optional[str] = None, limit: int = 10) -> List[ErrorInfo]:
         """Get recent errors"""
         errors = self.error_history
         if task_id:
-            errors = [e for e in errors if e.context.task_id == task_id]
+            errors = self._task_errors.get(task_id, ())
         
-        return errors[-limit:] if errors else []
+        if limit > 0:
+            # Walk back from the newest entry rather than copying the whole history
+            return list(islice(reversed(errors), limit))[::-1]
+        return list(errors)[-limit:] if errors else []
     
     def should_retry(self, task_id: str, error_type: Type[Exception]) -> bool:
         """Check if an error type should be retried for a task"""
-        retry_key = f"{task_id}:{error_type.__name__}"
-        return self.retry_counts.get(retry_key, 0) == 0
+        task_retry_counts = self.retry_counts.get(task_id)
+        return not task_retry_counts or task_retry_counts.get(error_type.__name__, 0) == 0
     
     def clear_retry_counts(self, task_id: str):
         """Clear retry counts for a task"""
-        keys_to_remove = [k for k in self.retry_counts.keys() if k.startswith(f"{task_id}:")]
-        for key in keys_to_remove:
-            del self.retry_counts[key]
+        self.retry_counts.pop(task_id, None)
     
     def create_user_error_report(self, task_id: str) -> Dict[str, Any]:
         """Create a user-friendly error report"""
-        task_errors = [e for e in self.error_history if e.context.task_id == task_id]
+        task_errors = self._task_errors.get(task_id, ())
+        unstored = self._task_unstored_counts.get(task_id)
         
-        if not task_errors:
+        if not task_errors and unstored is None:
             return {"has_errors": False}
         
         # Group by category
@@ -393,27 +636,47 @@ class QAErrorHandler:
         # Create summary
         summary = {
             "has_errors": True,
-            "total_errors": len(task_errors),
+            "total_errors": len(task_errors) + (unstored.total if unstored is not None else 0),
             "error_groups": {},
-            "recommended_actions": set()
+            "recommended_actions": []
         }
         
         for category, errors in error_groups.items():
+            # Errors of a category share their actions tuple, so dedupe the tuples
+            # first, then the actions, keeping first-seen order
+            action_lists = dict.fromkeys(e.suggested_actions for e in errors)
             group_info = {
                 "count": len(errors),
-                "severity": max(e.severity.value for e in errors),
+                "severity": max((e.severity for e in errors), key=_SEVERITY_RANK.__getitem__).value,
                 "messages": [e.user_message for e in errors[-3:]],  # Last 3 messages
-                "suggested_actions": []
+                "suggested_actions": list(dict.fromkeys(chain.from_iterable(action_lists)))
             }
             
-            # Collect suggested actions
-            for error in errors:
-                group_info["suggested_actions"].extend(error.suggested_actions)
-                summary["recommended_actions"].update(error.suggested_actions)
-            
             summary["error_groups"][category] = group_info
         
-        summary["recommended_actions"] = list(summary["recommended_actions"])
+        # Errors kept out of the history only have counts, so they add to their
+        # category's count and severity without messages
+        if unstored is not None:
+            for category, count in unstored.by_category.items():
+                severity = unstored.worst_severity_by_category[category]
+                group_info = summary["error_groups"].get(category.value)
+                if group_info is None:
+                    summary["error_groups"][category.value] = {
+                        "count": count,
+                        "severity": severity.value,
+                        "messages": [],
+                        "suggested_actions": list(
+                            _SUGGESTED_ACTIONS_BY_CATEGORY.get(category, _DEFAULT_SUGGESTED_ACTIONS)
+                        )
+                    }
+                else:
+                    group_info["count"] += count
+                    if _SEVERITY_RANK[severity] > _SEVERITY_RANK[ErrorSeverity(group_info["severity"])]:
+                        group_info["severity"] = severity.value
+        
+        summary["recommended_actions"] = list(dict.fromkeys(chain.from_iterable(
+            group_info["suggested_actions"] for group_info in summary["error_groups"].values()
+        )))
         
         return summary
 
@@ -465,7 +728,7 @@ async def handle_qa_error(
     )
     
     handler = get_error_handler()
-    return await handler.handle_error(error, context, task_id)
+    return handler.handle_error(error, context, task_id)
 
 
 def create_qa_task_error(
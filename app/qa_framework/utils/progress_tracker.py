@@ -6,18 +6,55 @@ including WebSocket/SSE integration for Canvas LTI interface updates.
 """
 
 import asyncio
+import inspect
 import json
 import logging
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Callable
-from weakref import WeakSet
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple, Union
+from weakref import WeakKeyDictionary, WeakMethod, finalize, ref
 
 from qa_framework.base.data_models import ProgressUpdate, ProgressStage, TaskStatus
 
+try:
+    # C JSON codec - serializes the update's datetime natively
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=_json_default)
+
 logger = logging.getLogger(__name__)
 
 
+def _subscriber_key(callback: Callable) -> Union[Callable, WeakMethod]:
+    """Hold bound methods weakly so a subscription doesn't keep its object alive"""
+    return WeakMethod(callback) if inspect.ismethod(callback) else callback
+
+
+class _WebSocketOutbox:
+    """Messages waiting to be sent on one WebSocket connection, and the task sending them"""
+    
+    __slots__ = ('messages', 'ready', 'consumer', 'send_started')
+    
+    def __init__(self):
+        # Latest serialized update per task; a newer one replaces any not yet sent,
+        # so the outbox never holds more than one message per task
+        self.messages: Dict[str, str] = {}
+        self.ready = asyncio.Event()
+        self.consumer: Optional[asyncio.Task] = None
+        # Monotonic time the current send_text call started, None between sends
+        self.send_started: Optional[float] = None
+
+
 class ProgressBroadcaster:
     """
     Centralized progress broadcasting for real-time updates.
@@ -27,33 +64,66 @@ class ProgressBroadcaster:
     """
     
     def __init__(self):
-        self._websocket_connections: WeakSet = WeakSet()
-        self._task_subscribers: Dict[str, Set[Callable]] = {}
-        self._progress_history: Dict[str, List[ProgressUpdate]] = {}
+        # Connections (held weakly), each with its outbox of unsent messages
+        self._websocket_connections: WeakKeyDictionary = WeakKeyDictionary()
+        # A client whose send has been pending this long is dropped
+        self._websocket_send_timeout = 10.0
+        # Subscribers by task (bound methods as weak refs), each paired with
+        # whether it is a coroutine function; rebuilt on change so dispatch
+        # can iterate without copying
+        self._task_subscribers: Dict[str, Tuple[Tuple[Union[Callable, WeakMethod], bool], ...]] = {}
+        # Subscriber count per task, kept in step with _task_subscribers for stats
+        self._subscriber_counts: Dict[str, int] = {}
+        self._progress_history: Dict[str, Deque[ProgressUpdate]] = {}
         self._max_history_size = 100
     
     def add_websocket_connection(self, websocket):
-        """Add a WebSocket connection for progress updates"""
-        self._websocket_connections.add(websocket)
+        """
+        Add a WebSocket connection for progress updates.
+        
+        Doesn't need a running event loop: the task that sends the
+        connection's messages starts with the first broadcast. It ends when a
+        send fails, the connection is removed or the connection is garbage
+        collected.
+        """
+        if websocket in self._websocket_connections:
+            return
+        self._websocket_connections[websocket] = _WebSocketOutbox()
         logger.debug(f"Added WebSocket connection: {id(websocket)}")
     
     def remove_websocket_connection(self, websocket):
         """Remove a WebSocket connection"""
-        self._websocket_connections.discard(websocket)
+        outbox = self._websocket_connections.pop(websocket, None)
+        if outbox is not None and outbox.consumer is not None:
+            outbox.consumer.cancel()
         logger.debug(f"Removed WebSocket connection: {id(websocket)}")
     
     def subscribe_to_task(self, task_id: str, callback: Callable):
         """Subscribe to progress updates for a specific task"""
-        if task_id not in self._task_subscribers:
-            self._task_subscribers[task_id] = set()
-        self._task_subscribers[task_id].add(callback)
+        subscribers = self._task_subscribers.get(task_id, ())
+        key = _subscriber_key(callback)
+        if any(existing == key for existing, _ in subscribers):
+            return
+        self._set_task_subscribers(
+            task_id, (*subscribers, (key, asyncio.iscoroutinefunction(callback)))
+        )
     
     def unsubscribe_from_task(self, task_id: str, callback: Callable):
         """Unsubscribe from task progress updates"""
         if task_id in self._task_subscribers:
-            self._task_subscribers[task_id].discard(callback)
-            if not self._task_subscribers[task_id]:
-                del self._task_subscribers[task_id]
+            key = _subscriber_key(callback)
+            self._set_task_subscribers(task_id, tuple(
+                entry for entry in self._task_subscribers[task_id] if entry[0] != key
+            ))
+    
+    def _set_task_subscribers(self, task_id: str, subscribers: Tuple):
+        """Replace a task's subscribers, dropping the task once none are left"""
+        if subscribers:
+            self._task_subscribers[task_id] = subscribers
+            self._subscriber_counts[task_id] = len(subscribers)
+        else:
+            self._task_subscribers.pop(task_id, None)
+            self._subscriber_counts.pop(task_id, None)
     
     async def broadcast_progress(self, progress: ProgressUpdate):
         """
@@ -64,83 +134,150 @@ class ProgressBroadcaster:
         """
         task_id = progress.task_id
         
-        # Store in history
-        if task_id not in self._progress_history:
-            self._progress_history[task_id] = []
-        
-        self._progress_history[task_id].append(progress)
-        
-        # Limit history size
-        if len(self._progress_history[task_id]) > self._max_history_size:
-            self._progress_history[task_id] = self._progress_history[task_id][-self._max_history_size:]
-        
-        # Prepare message
-        message = {
-            'type': 'progress_update',
-            'data': progress.dict()
-        }
+        # Store in history (bounded; the oldest update drops off once full)
+        history = self._progress_history.get(task_id)
+        if history is None:
+            history = self._progress_history[task_id] = deque(maxlen=self._max_history_size)
+        history.append(progress)
         
-        # Broadcast to WebSocket connections
-        await self._broadcast_to_websockets(message)
+        # Broadcast to WebSocket connections, serializing the message once for all of them
+        if self._websocket_connections:
+            message = _json_dumps({
+                'type': 'progress_update',
+                'data': progress.dict()
+            })
+            await self._broadcast_to_websockets(task_id, message)
         
         # Notify task-specific subscribers
         await self._notify_task_subscribers(task_id, progress)
     
-    async def _broadcast_to_websockets(self, message: Dict[str, Any]):
-        """Broadcast message to all WebSocket connections"""
+    async def _broadcast_to_websockets(self, task_id: str, message: str):
+        """
+        Add a serialized progress message to every WebSocket connection's outbox.
+        
+        Never waits on a send. A message replaces any unsent one for the same
+        task, so a client that falls behind gets the latest update rather than
+        a backlog; only a client stuck in a single send past the send timeout
+        is dropped.
+        """
         if not self._websocket_connections:
             return
         
-        message_str = json.dumps(message)
-        
-        # Create tasks for all connections
-        tasks = []
-        for websocket in list(self._websocket_connections):
-            tasks.append(self._send_websocket_message(websocket, message_str))
+        now = time.monotonic()
+        stuck = []
+        for websocket, outbox in self._websocket_connections.items():
+            if (
+                outbox.send_started is not None
+                and now - outbox.send_started > self._websocket_send_timeout
+            ):
+                stuck.append(websocket)
+                continue
+            
+            messages = outbox.messages
+            messages.pop(task_id, None)
+            messages[task_id] = message
+            outbox.ready.set()
+            if outbox.consumer is None:
+                outbox.consumer = asyncio.create_task(
+                    self._consume_websocket_outbox(ref(websocket), outbox)
+                )
+                finalize(websocket, outbox.consumer.cancel)
         
-        # Send to all connections concurrently
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        for websocket in stuck:
+            logger.warning(f"Dropping stuck WebSocket connection: {id(websocket)}")
+            self.remove_websocket_connection(websocket)
     
-    async def _send_websocket_message(self, websocket, message: str):
-        """Send message to a single WebSocket connection"""
-        try:
-            await websocket.send_text(message)
-        except Exception as e:
-            logger.warning(f"Failed to send WebSocket message: {e}")
-            # Remove failed connection
-            self._websocket_connections.discard(websocket)
+    async def _consume_websocket_outbox(self, websocket_ref: ref, outbox: _WebSocketOutbox):
+        """
+        Send a single WebSocket connection's outbox messages as they arrive.
+        
+        Takes everything that piled up while the previous sends ran - the
+        latest update per task - and sends each as its own JSON frame.
+        """
+        while True:
+            await outbox.ready.wait()
+            outbox.ready.clear()
+            messages, outbox.messages = outbox.messages, {}
+            
+            websocket = websocket_ref()
+            if websocket is None:
+                return
+            try:
+                for message in messages.values():
+                    outbox.send_started = time.monotonic()
+                    await websocket.send_text(message)
+            except Exception as e:
+                logger.warning(f"Failed to send WebSocket message: {e}")
+                # Remove failed connection (unless it was re-added with a new outbox)
+                if self._websocket_connections.get(websocket) is outbox:
+                    del self._websocket_connections[websocket]
+                return
+            finally:
+                outbox.send_started = None
+            # Don't keep the connection alive while waiting for the next message
+            del websocket
     
     async def _notify_task_subscribers(self, task_id: str, progress: ProgressUpdate):
         """Notify task-specific subscribers"""
-        if task_id not in self._task_subscribers:
+        subscribers = self._task_subscribers.get(task_id)
+        if not subscribers:
             return
         
-        # Notify all subscribers for this task
-        for callback in list(self._task_subscribers[task_id]):
+        # Call synchronous subscribers inline and run async ones concurrently,
+        # so one slow subscriber doesn't hold up the others
+        dead = []
+        failed = []
+        async_keys = []
+        coroutines = []
+        for key, is_async in subscribers:
+            callback = key() if isinstance(key, WeakMethod) else key
+            if callback is None:
+                # Bound method whose object has been garbage collected
+                dead.append(key)
+                continue
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(progress)
+                if is_async:
+                    coroutines.append(callback(progress))
+                    async_keys.append(key)
                 else:
                     callback(progress)
             except Exception as e:
-                logger.error(f"Error in progress callback for task {task_id}: {e}")
-                # Remove failed callback
-                self._task_subscribers[task_id].discard(callback)
+                failed.append((key, e))
+        
+        if coroutines:
+            results = await asyncio.gather(*coroutines, return_exceptions=True)
+            failed.extend(
+                (key, result) for key, result in zip(async_keys, results, strict=True)
+                if isinstance(result, Exception)
+            )
+        
+        for key, e in failed:
+            logger.error(f"Error in progress callback for task {task_id}: {e}")
+            dead.append(key)
+        
+        # Remove dead and failed callbacks in one pass, after dispatch (from the
+        # current subscribers, which may have changed while awaiting)
+        if dead:
+            dead_ids = {id(key) for key in dead}
+            self._set_task_subscribers(task_id, tuple(
+                entry for entry in self._task_subscribers.get(task_id, ())
+                if id(entry[0]) not in dead_ids
+            ))
     
     def get_task_progress_history(self, task_id: str) -> List[ProgressUpdate]:
         """Get progress history for a task"""
-        return self._progress_history.get(task_id, [])
+        return list(self._progress_history.get(task_id, ()))
     
     def get_latest_progress(self, task_id: str) -> Optional[ProgressUpdate]:
         """Get the latest progress update for a task"""
-        history = self._progress_history.get(task_id, [])
+        history = self._progress_history.get(task_id)
         return history[-1] if history else None
     
     def clear_task_history(self, task_id: str):
         """Clear progress history for a task"""
         self._progress_history.pop(task_id, None)
         self._task_subscribers.pop(task_id, None)
+        self._subscriber_counts.pop(task_id, None)
     
     def get_active_tasks(self) -> List[str]:
         """Get list of tasks with active progress tracking"""
@@ -150,10 +287,7 @@ class ProgressBroadcaster:
         """Get connection statistics"""
         return {
             'active_websockets': len(self._websocket_connections),
-            'task_subscribers': {
-                task_id: len(callbacks) 
-                for task_id, callbacks in self._task_subscribers.items()
-            },
+            'task_subscribers': dict(self._subscriber_counts),
             'tasks_with_history': len(self._progress_history)
         }
 
@@ -164,8 +298,16 @@ class TaskProgressTracker:
     
     Provides detailed progress reporting with time estimation,
     Canvas API statistics, and performance metrics.
+    
+    Rapid updates are coalesced: one is broadcast immediately on a stage
+    change, a new error, completion, a large enough percentage change or
+    once the broadcast interval has passed; otherwise only the latest is
+    sent when the interval ends.
     """
     
+    BROADCAST_INTERVAL_SECONDS = 0.1
+    BROADCAST_MIN_PERCENT_CHANGE = 1.0
+    
     def __init__(self, task_id: str, broadcaster: Optional[ProgressBroadcaster] = None):
         self.task_id = task_id
         self.broadcaster = broadcaster or get_progress_broadcaster()
@@ -188,6 +330,14 @@ class TaskProgressTracker:
         # Time estimation
         self.estimated_total_items = 0
         self.processing_rate_items_per_second = 0.0
+        
+        # Broadcast coalescing
+        self._last_broadcast_time = 0.0
+        self._last_broadcast_percentage = -1.0
+        self._last_broadcast_stage: Optional[ProgressStage] = None
+        self._last_broadcast_errors = 0
+        self._pending_update: Optional[Tuple[ProgressUpdate, float]] = None
+        self._pending_flush: Optional[asyncio.Task] = None
     
     async def start_stage(self, stage: ProgressStage, message: str = ""):
         """Start a new progress stage"""
@@ -203,7 +353,7 @@ class TaskProgressTracker:
         self.stage_start_times[stage] = now
         self.current_message = message
         
-        await self._update_progress()
+        await self._update_progress(now=now)
     
     async def update_progress(
         self, 
@@ -211,7 +361,7 @@ class TaskProgressTracker:
         total: int, 
         message: str = "",
         **kwargs
-    ):
+    ) -> ProgressUpdate:
         """Update progress within current stage"""
         self.current_progress = (current / total * 100) if total > 0 else 0
         self.current_message = message or self.current_message
@@ -226,20 +376,28 @@ class TaskProgressTracker:
         if 'errors' in kwargs:
             self.errors_encountered += kwargs['errors']
         
-        # Calculate processing rate
-        if self.items_processed > 0:
-            elapsed = time.time() - self.start_time
-            self.processing_rate_items_per_second = self.items_processed / elapsed
-        
         # Update estimated total if provided
         if 'estimated_total' in kwargs:
             self.estimated_total_items = kwargs['estimated_total']
         
-        await self._update_progress(current, total, **kwargs)
+        return await self._update_progress(current, total, **kwargs)
     
-    async def _update_progress(self, current: int = 0, total: int = 100, **kwargs):
-        """Send progress update to broadcaster"""
-        now = datetime.utcnow()
+    async def _update_progress(
+        self,
+        current: int = 0,
+        total: int = 100,
+        now: Optional[float] = None,
+        **kwargs
+    ) -> ProgressUpdate:
+        """Build a progress update and send it to the broadcaster, coalescing rapid broadcasts"""
+        # One clock read per update, shared by the rate and the timestamp
+        if now is None:
+            now = time.time()
+        
+        # Calculate processing rate
+        if self.items_processed > 0:
+            elapsed = now - self.start_time
+            self.processing_rate_items_per_second = self.items_processed / elapsed
         
         # Calculate time estimates
         estimated_completion_seconds = None
@@ -262,15 +420,52 @@ class TaskProgressTracker:
             items_remaining=max(0, self.estimated_total_items - self.items_processed),
             estimated_completion_seconds=estimated_completion_seconds,
             api_calls_made=self.api_calls_made,
-            timestamp=now,
+            timestamp=datetime.utcfromtimestamp(now),
             **kwargs
         )
         
-        # Broadcast update
-        await self.broadcaster.broadcast_progress(progress)
+        if self._should_broadcast(current, total, now):
+            await self._broadcast_update(progress, now)
+        else:
+            # Hold back the latest update; the pending flush broadcasts it
+            self._pending_update = (progress, now)
+            if self._pending_flush is None:
+                delay = self.BROADCAST_INTERVAL_SECONDS - (now - self._last_broadcast_time)
+                self._pending_flush = asyncio.create_task(self._flush_pending_update(delay))
         
         return progress
     
+    def _should_broadcast(self, current: int, total: int, now: float) -> bool:
+        """Check whether an update is significant enough to send right away"""
+        return (
+            self.current_stage != self._last_broadcast_stage
+            or self.errors_encountered != self._last_broadcast_errors
+            or current >= total
+            or now - self._last_broadcast_time >= self.BROADCAST_INTERVAL_SECONDS
+            or abs(self.current_progress - self._last_broadcast_percentage) >= self.BROADCAST_MIN_PERCENT_CHANGE
+        )
+    
+    async def _flush_pending_update(self, delay: float):
+        """Broadcast the held-back update once the broadcast interval has passed"""
+        await asyncio.sleep(delay)
+        self._pending_flush = None
+        if self._pending_update is not None:
+            await self._broadcast_update(*self._pending_update)
+    
+    async def _broadcast_update(self, progress: ProgressUpdate, now: float):
+        """Broadcast a progress update, superseding any held-back one"""
+        self._pending_update = None
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
+        
+        self._last_broadcast_time = now
+        self._last_broadcast_percentage = self.current_progress
+        self._last_broadcast_stage = self.current_stage
+        self._last_broadcast_errors = self.errors_encountered
+        
+        await self.broadcaster.broadcast_progress(progress)
+    
     async def complete_stage(self, stage: ProgressStage, message: str = ""):
         """Complete current stage"""
         await self.start_stage(stage, message)
@@ -34,6 +34,18 @@ from app.core.canvas_error_handler import (
     classify_canvas_error
 )
 
+try:
+    # C JSON codec - Canvas page/assignment payloads carry large HTML bodies
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
@@ -122,6 +134,7 @@ class ProductionCanvasService:
             self.session = aiohttp.ClientSession(
                 timeout=timeout,
                 connector=connector,
+                json_serialize=_json_dumps,
                 headers={
                     'Authorization': f'Bearer {self.access_token}',
                     'Content-Type': 'application/json',
@@ -209,7 +222,7 @@ class ProductionCanvasService:
                         if paginated and method == 'GET':
                             return await self._handle_paginated_response(response, url, params)
                         else:
-                            return await response.json()
+                            return await response.json(loads=_json_loads)
                     
                     # Handle error responses
                     canvas_error = classify_canvas_error(
@@ -297,7 +310,7 @@ class ProductionCanvasService:
         
         while True:
             # Parse current page
-            data = await current_response.json()
+            data = await current_response.json(loads=_json_loads)
             if isinstance(data, list):
                 all_results.extend(data)
             else:
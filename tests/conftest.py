@@ -0,0 +1,13 @@
+"""
+Shared test configuration
+
+The QA framework imports itself as the top-level ``qa_framework`` package
+(the app runs from the ``app`` directory), so make that importable here.
+"""
+
+import sys
+from pathlib import Path
+
+APP_DIR = str(Path(__file__).resolve().parent.parent / "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
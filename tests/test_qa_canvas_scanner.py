@@ -0,0 +1,232 @@
+"""
+Canvas Content Scanner Tests
+
+Tests that URL replacement gives the same results whichever backend is in
+use: RE2 or re for matching, lxml or BeautifulSoup for rewriting HTML.
+"""
+
+from collections import Counter
+
+import pytest
+from bs4 import BeautifulSoup
+
+from qa_framework.base import FindReplaceConfig
+from qa_framework.utils import canvas_scanner
+from qa_framework.utils.canvas_scanner import URLReplacer
+
+
+def make_config(url_mappings, **options) -> FindReplaceConfig:
+    """Build a Find & Replace config for the given mappings and options."""
+    return FindReplaceConfig(
+        course_id="course-1",
+        user_id="user-1",
+        canvas_instance_url="https://canvas.test.edu",
+        url_mappings=url_mappings,
+        **options
+    )
+
+
+@pytest.fixture
+def fresh_replacer_caches():
+    """Clear compiled patterns and shared replacers around a test that switches backends."""
+    canvas_scanner._compile_pattern.cache_clear()
+    canvas_scanner._shared_url_replacer.cache_clear()
+    yield
+    canvas_scanner._compile_pattern.cache_clear()
+    canvas_scanner._shared_url_replacer.cache_clear()
+
+
+@pytest.fixture(params=["re2", "re"])
+def regex_backend(request, monkeypatch, fresh_replacer_caches):
+    """Run a test with RE2 compiling URL patterns, then with the re fallback."""
+    if request.param == "re2":
+        pytest.importorskip("re2")
+    else:
+        monkeypatch.setattr(canvas_scanner, "re2", None)
+    return request.param
+
+
+OVERLAPPING_MAPPINGS = [
+    {"find": "https://old.edu", "replace": "https://new.edu"},
+    {"find": "https://old.edu/a", "replace": "https://new.edu/alpha"},
+]
+
+
+class TestRegexBackends:
+    """Test URL patterns behave the same under RE2 and re."""
+    
+    def test_patterns_compile_with_selected_backend(self, regex_backend):
+        """Test the replacer's pattern comes from the backend under test."""
+        replacer = URLReplacer(OVERLAPPING_MAPPINGS, make_config(OVERLAPPING_MAPPINGS))
+        
+        assert type(replacer.pattern).__module__ == regex_backend
+    
+    @pytest.mark.parametrize("options, value, expected", [
+        (
+            {},
+            "See HTTPS://OLD.EDU/a/b and https://old.edu/b",
+            "See https://new.edu/alpha/b and https://new.edu/b",
+        ),
+        (
+            {"whole_word_only": True},
+            "See HTTPS://OLD.EDU/a/b and https://old.edu/b",
+            "See https://new.edu/alpha/b and https://new.edu/b",
+        ),
+        (
+            {"case_sensitive": True, "whole_word_only": True},
+            "See HTTPS://OLD.EDU/a/b and https://old.edu/a",
+            "See HTTPS://OLD.EDU/a/b and https://new.edu/alpha",
+        ),
+    ])
+    def test_replacements_match_across_backends(self, regex_backend, options, value, expected):
+        """Test overlapping mappings prefer the longest match under either backend."""
+        replacer = URLReplacer(OVERLAPPING_MAPPINGS, make_config(OVERLAPPING_MAPPINGS, **options))
+        
+        new_value, applied = replacer.replace(value)
+        
+        assert new_value == expected
+        assert applied
+    
+    def test_single_mapping_ignores_case(self, regex_backend):
+        """Test the single-mapping fast path matches case-insensitively under either backend."""
+        mappings = [{"find": "https://old.edu", "replace": "https://new.edu"}]
+        replacer = URLReplacer(mappings, make_config(mappings))
+        
+        assert replacer.replace("Go to HTTPS://Old.Edu/page") == (
+            "Go to https://new.edu/page", [("https://old.edu", "https://new.edu")]
+        )
+
+
+SMALL_PAGE = (
+    '<h2>Course links</h2>\n'
+    '<p>Visit <a href="https://old.edu/courses/12" title="https://old.edu">the course</a> '
+    'or https://OLD.edu/help for support.</p>\n'
+    '<img src="https://old.edu/images/banner.png" alt="Banner">\n'
+    '<ul><li><a href="https://other.edu/page">Other site</a></li></ul>\n'
+    '<!-- https://old.edu/courses in a comment -->\n'
+    '<script>var home = "https://old.edu";</script>'
+)
+
+FILLER_BLOCKS = [
+    f'<div class="block"><p>Paragraph {index} with <a href="https://other.edu/{index}">a link</a> '
+    f'&amp; some text.</p></div>\n'
+    for index in range(900)
+]
+
+# Over the pruning threshold, with the mapped URLs in a few blocks among many without
+LARGE_PAGE = (
+    ''.join(FILLER_BLOCKS[:450])
+    + SMALL_PAGE
+    + ''.join(FILLER_BLOCKS[450:])
+    + '<p>Last link: <a href="https://old.edu/courses/99">https://old.edu/courses/99</a></p>'
+)
+
+# Overlapping find URLs - the longest must win, whichever backend rewrites the HTML
+NESTED_MAPPINGS = [
+    {"find": "https://old.edu", "replace": "https://new.edu"},
+    {"find": "https://old.edu/courses", "replace": "https://lms.new.edu/c"},
+]
+
+
+def normalize_markup(content: str) -> str:
+    """
+    Serialize content through one serializer.
+    
+    BeautifulSoup sorts attributes and self-closes void elements while lxml
+    keeps them as written, so outputs are compared as parsed trees.
+    """
+    return str(BeautifulSoup(content, "html.parser"))
+
+
+class TestHtmlBackends:
+    """Test the lxml rewrite and the BeautifulSoup fallback rewrite content identically."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", [SMALL_PAGE, LARGE_PAGE], ids=["small", "large"])
+    @pytest.mark.parametrize("options", [
+        {},
+        {"case_sensitive": True},
+        {"whole_word_only": True},
+        {"include_html_attributes": False},
+    ])
+    async def test_lxml_and_beautifulsoup_rewrites_match(
+        self, monkeypatch, fresh_replacer_caches, content, options
+    ):
+        """Test both HTML backends apply the same replacements to the same places."""
+        config = make_config(NESTED_MAPPINGS, **options)
+        
+        # The lxml path must really handle the content rather than fall back
+        url_replacer = URLReplacer.for_config(NESTED_MAPPINGS, config).for_content(content)
+        assert canvas_scanner._replace_urls_with_lxml(
+            content, url_replacer, config.include_html_attributes, [], Counter()
+        ) is not None
+        
+        lxml_content, lxml_replacements = await canvas_scanner.replace_urls_in_content(
+            content, NESTED_MAPPINGS, config
+        )
+        with monkeypatch.context() as patch:
+            patch.setattr(canvas_scanner, "lxml_html", None)
+            soup_content, soup_replacements = await canvas_scanner.replace_urls_in_content(
+                content, NESTED_MAPPINGS, config
+            )
+        
+        assert lxml_content != content
+        assert lxml_replacements == soup_replacements
+        assert normalize_markup(lxml_content) == normalize_markup(soup_content)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "tag", ["iframe", "textarea", "noembed", "noframes", "xmp", "plaintext"]
+    )
+    async def test_raw_text_elements_keep_their_content(
+        self, monkeypatch, fresh_replacer_caches, tag
+    ):
+        """Test elements libxml2 reads as raw text go to BeautifulSoup and keep their markup."""
+        content = (
+            f'<p>See https://old.edu/help</p>'
+            f'<{tag} src="https://old.edu/a"><p>Your browser &amp; stuff</p></{tag}>'
+        )
+        config = make_config(NESTED_MAPPINGS)
+        
+        url_replacer = URLReplacer.for_config(NESTED_MAPPINGS, config).for_content(content)
+        assert canvas_scanner._replace_urls_with_lxml(
+            content, url_replacer, True, [], Counter()
+        ) is None
+        
+        new_content, replacements = await canvas_scanner.replace_urls_in_content(
+            content, NESTED_MAPPINGS, config
+        )
+        with monkeypatch.context() as patch:
+            patch.setattr(canvas_scanner, "lxml_html", None)
+            soup_content, soup_replacements = await canvas_scanner.replace_urls_in_content(
+                content, NESTED_MAPPINGS, config
+            )
+        
+        assert new_content == soup_content
+        assert replacements == soup_replacements
+        assert new_content == (
+            f'<p>See https://new.edu/help</p>'
+            f'<{tag} src="https://new.edu/a"><p>Your browser &amp; stuff</p></{tag}>'
+        )
+    
+    @pytest.mark.asyncio
+    async def test_large_page_prefers_longest_mapping(self, monkeypatch, fresh_replacer_caches):
+        """Test the pruned large-page rewrite applies overlapping mappings longest first."""
+        assert len(LARGE_PAGE) > canvas_scanner._PRUNE_MIN_LENGTH
+        config = make_config(NESTED_MAPPINGS)
+        
+        for lxml_html in (canvas_scanner.lxml_html, None):
+            with monkeypatch.context() as patch:
+                patch.setattr(canvas_scanner, "lxml_html", lxml_html)
+                new_content, _ = await canvas_scanner.replace_urls_in_content(
+                    LARGE_PAGE, NESTED_MAPPINGS, config
+                )
+            
+            assert 'href="https://lms.new.edu/c/12"' in new_content
+            assert 'href="https://lms.new.edu/c/99">https://lms.new.edu/c/99<' in new_content
+            assert 'src="https://new.edu/images/banner.png"' in new_content
+            assert "https://new.edu/help" in new_content
+            # Untouched: non-URL attributes, script text and unmapped links
+            assert 'title="https://old.edu"' in new_content
+            assert 'var home = "https://old.edu"' in new_content
+            assert new_content.count("https://other.edu/") == len(FILLER_BLOCKS) + 1
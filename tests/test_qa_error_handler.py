@@ -0,0 +1,140 @@
+"""
+QA Error Handler Tests
+
+Tests for error statistics and user error reports in the QA framework's
+error handler.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from qa_framework.utils.error_handler import (
+    CanvasAPIErrorClassifier,
+    ErrorCategory,
+    ErrorContext,
+    ErrorInfo,
+    ErrorSeverity,
+    QAErrorHandler,
+    RecoveryStrategy,
+)
+
+
+def make_context(task_id: str = "task-1") -> ErrorContext:
+    """Build an error context for a test task."""
+    return ErrorContext(
+        task_id=task_id,
+        task_type="find_replace",
+        user_id="user-1",
+        course_id="course-1",
+        canvas_instance="test",
+        timestamp=datetime.utcnow(),
+        stage="processing",
+        additional_data={}
+    )
+
+
+class TestErrorStatistics:
+    """Test error statistics and reports across stored and filtered-out errors."""
+    
+    def test_skipped_errors_count_for_their_task(self):
+        """Test low-severity skipped errors (e.g. 404s) count in task stats and reports."""
+        handler = QAErrorHandler()
+        
+        for _ in range(3):
+            error_info = handler.handle_error(Exception("404 Not Found"), make_context(), "task-1")
+        
+        # Kept out of the history by the default store filter
+        assert not handler.store_filter(error_info)
+        assert handler.get_recent_errors("task-1") == []
+        
+        task_stats = handler.get_error_statistics("task-1")
+        global_stats = handler.get_error_statistics()
+        report = handler.create_user_error_report("task-1")
+        
+        assert task_stats["total_errors"] == 3
+        assert task_stats["total_errors"] == global_stats["total_errors"]
+        assert task_stats["by_category"] == global_stats["by_category"]
+        assert report["has_errors"] is True
+        assert report["total_errors"] == 3
+        assert report["error_groups"]["canvas_api"]["count"] == 3
+        assert report["error_groups"]["canvas_api"]["severity"] == "low"
+    
+    def test_task_totals_agree_with_global_totals(self):
+        """Test per-task totals add up to the global total with a mix of stored and skipped errors."""
+        handler = QAErrorHandler()
+        
+        handler.handle_error(Exception("404 Not Found"), make_context("task-1"), "task-1")
+        handler.handle_error(Exception("rate limit exceeded"), make_context("task-1"), "task-1")
+        handler.handle_error(Exception("404 Not Found"), make_context("task-2"), "task-2")
+        handler.handle_error(Exception("401 unauthorized"), make_context("task-2"), "task-2")
+        handler.handle_error(Exception("401 unauthorized"), make_context("task-2"), "task-2")
+        
+        task_1 = handler.get_error_statistics("task-1")
+        task_2 = handler.get_error_statistics("task-2")
+        global_stats = handler.get_error_statistics()
+        
+        assert task_1["total_errors"] == 2
+        assert task_2["total_errors"] == 3
+        assert task_1["total_errors"] + task_2["total_errors"] == global_stats["total_errors"]
+        assert task_2["by_severity"] == {"low": 1, "high": 2}
+        
+        for task_id, stats in (("task-1", task_1), ("task-2", task_2)):
+            report = handler.create_user_error_report(task_id)
+            assert report["total_errors"] == stats["total_errors"]
+            assert sum(group["count"] for group in report["error_groups"].values()) == stats["total_errors"]
+    
+    def test_task_without_errors(self):
+        """Test a task with no errors reports none."""
+        handler = QAErrorHandler()
+        
+        assert handler.get_error_statistics("missing") == {"total_errors": 0}
+        assert handler.create_user_error_report("missing") == {"has_errors": False}
+
+
+class TestErrorReportSeverity:
+    """Test the severity reported for a group of errors."""
+    
+    @pytest.fixture
+    def handler_with_severities(self, monkeypatch):
+        """Handler whose classifier assigns severities in the order given."""
+        def make_handler(severities):
+            remaining = iter(severities)
+            
+            def classify_error(error, context):
+                return ErrorInfo(
+                    error=error,
+                    category=ErrorCategory.CANVAS_API,
+                    severity=next(remaining),
+                    recovery_strategy=RecoveryStrategy.FALLBACK,
+                    context=context,
+                    user_message=str(error),
+                    technical_message=str(error),
+                    suggested_actions=()
+                )
+            
+            monkeypatch.setattr(CanvasAPIErrorClassifier, "classify_error", staticmethod(classify_error))
+            handler = QAErrorHandler()
+            for index in range(len(severities)):
+                handler.handle_error(Exception(f"error {index}"), make_context(), "task-1")
+            return handler
+        
+        return make_handler
+    
+    @pytest.mark.parametrize("severities, expected", [
+        (
+            [ErrorSeverity.LOW, ErrorSeverity.CRITICAL, ErrorSeverity.MEDIUM, ErrorSeverity.HIGH],
+            "critical"
+        ),
+        # String order would pick "medium" here
+        ([ErrorSeverity.HIGH, ErrorSeverity.LOW, ErrorSeverity.MEDIUM], "high"),
+        ([ErrorSeverity.LOW, ErrorSeverity.MEDIUM], "medium"),
+    ])
+    def test_group_reports_highest_severity_by_rank(self, handler_with_severities, severities, expected):
+        """Test a group's severity is its highest-ranked error's, not the max by string."""
+        handler = handler_with_severities(severities)
+        
+        report = handler.create_user_error_report("task-1")
+        
+        assert report["error_groups"]["canvas_api"]["count"] == len(severities)
+        assert report["error_groups"]["canvas_api"]["severity"] == expected
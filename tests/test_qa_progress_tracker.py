@@ -0,0 +1,290 @@
+"""
+Progress Tracker Tests
+
+Tests for progress broadcasting to WebSocket clients and task subscribers,
+and for the coalescing of rapid task progress updates.
+"""
+
+import asyncio
+import gc
+import json
+
+import pytest
+
+from qa_framework.base import ProgressStage, ProgressUpdate
+from qa_framework.utils.progress_tracker import ProgressBroadcaster, TaskProgressTracker
+
+
+class RecordingWebSocket:
+    """WebSocket stand-in recording each frame it is sent."""
+    
+    def __init__(self):
+        self.frames = []
+    
+    async def send_text(self, message: str):
+        self.frames.append(json.loads(message))
+
+
+class BlockedWebSocket(RecordingWebSocket):
+    """WebSocket whose sends wait until released."""
+    
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+    
+    async def send_text(self, message: str):
+        await self.release.wait()
+        await super().send_text(message)
+
+
+class FailingWebSocket:
+    """WebSocket whose sends always fail, like a closed connection."""
+    
+    async def send_text(self, message: str):
+        raise ConnectionError("connection closed")
+
+
+class Subscriber:
+    """Object with a bound-method subscriber recording updates."""
+    
+    def __init__(self):
+        self.updates = []
+    
+    def on_progress(self, progress: ProgressUpdate):
+        self.updates.append(progress)
+
+
+def make_update(task_id: str, current: int, total: int = 100) -> ProgressUpdate:
+    """Build a processing-stage progress update."""
+    return ProgressUpdate(
+        task_id=task_id,
+        stage=ProgressStage.PROCESSING,
+        current=current,
+        total=total,
+        percentage=current / total * 100
+    )
+
+
+async def drain():
+    """Let consumer tasks send what is waiting in their outboxes."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestWebSocketBroadcast:
+    """Test progress messages reach WebSocket clients without stalling broadcasts."""
+    
+    def test_connection_can_be_added_without_running_loop(self):
+        """Test adding a connection is synchronous, as before the outbox existed."""
+        broadcaster = ProgressBroadcaster()
+        websocket = RecordingWebSocket()
+        
+        broadcaster.add_websocket_connection(websocket)
+        
+        assert broadcaster.get_connection_stats()['active_websockets'] == 1
+        
+        async def broadcast():
+            await broadcaster.broadcast_progress(make_update("task-1", 50))
+            await drain()
+        
+        asyncio.run(broadcast())
+        assert [frame['data']['current'] for frame in websocket.frames] == [50]
+    
+    @pytest.mark.asyncio
+    async def test_fast_client_survives_burst_without_yielding(self):
+        """Test a producer that never yields doesn't get a healthy client dropped."""
+        broadcaster = ProgressBroadcaster()
+        websocket = RecordingWebSocket()
+        broadcaster.add_websocket_connection(websocket)
+        tracker = TaskProgressTracker("task-1", broadcaster)
+        
+        for current in range(100):
+            await tracker.update_progress(current, 100)
+        await drain()
+        
+        assert broadcaster.get_connection_stats()['active_websockets'] == 1
+        assert websocket.frames
+        assert websocket.frames[-1]['data']['current'] == 99
+    
+    @pytest.mark.asyncio
+    async def test_backlog_is_merged_to_latest_update_per_task(self):
+        """Test updates queued behind a slow send collapse to one frame per task."""
+        broadcaster = ProgressBroadcaster()
+        websocket = BlockedWebSocket()
+        broadcaster.add_websocket_connection(websocket)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        await drain()
+        # The consumer is now waiting in send_text for task-1 at 1
+        for current in range(2, 200):
+            await broadcaster.broadcast_progress(make_update("task-1", current, 1000))
+            await broadcaster.broadcast_progress(make_update("task-2", current, 1000))
+        
+        websocket.release.set()
+        await drain()
+        
+        assert [
+            (frame['data']['task_id'], frame['data']['current']) for frame in websocket.frames
+        ] == [("task-1", 1), ("task-1", 199), ("task-2", 199)]
+        assert broadcaster.get_connection_stats()['active_websockets'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stuck_client_is_dropped_after_send_timeout(self):
+        """Test only a client stuck in one send past the deadline is disconnected."""
+        broadcaster = ProgressBroadcaster()
+        broadcaster._websocket_send_timeout = 0.05
+        stuck = BlockedWebSocket()
+        healthy = RecordingWebSocket()
+        broadcaster.add_websocket_connection(stuck)
+        broadcaster.add_websocket_connection(healthy)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        await drain()
+        await broadcaster.broadcast_progress(make_update("task-1", 2))
+        assert broadcaster.get_connection_stats()['active_websockets'] == 2
+        
+        await asyncio.sleep(0.1)
+        await broadcaster.broadcast_progress(make_update("task-1", 3))
+        await drain()
+        
+        assert broadcaster.get_connection_stats()['active_websockets'] == 1
+        assert [frame['data']['current'] for frame in healthy.frames] == [1, 2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_connection(self):
+        """Test a connection whose send fails is removed and others keep receiving."""
+        broadcaster = ProgressBroadcaster()
+        healthy = RecordingWebSocket()
+        broadcaster.add_websocket_connection(FailingWebSocket())
+        broadcaster.add_websocket_connection(healthy)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        await drain()
+        
+        assert broadcaster.get_connection_stats()['active_websockets'] == 1
+        assert len(healthy.frames) == 1
+
+
+class TestTaskSubscribers:
+    """Test per-task subscriber dispatch, pruning and statistics."""
+    
+    @pytest.mark.asyncio
+    async def test_async_subscribers_run_concurrently(self):
+        """Test a slow async subscriber doesn't delay the others."""
+        broadcaster = ProgressBroadcaster()
+        started = []
+        
+        async def slow(progress):
+            started.append("slow")
+            await asyncio.sleep(0.05)
+        
+        async def fast(progress):
+            started.append("fast")
+        
+        broadcaster.subscribe_to_task("task-1", slow)
+        broadcaster.subscribe_to_task("task-1", fast)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        
+        assert sorted(started) == ["fast", "slow"]
+    
+    @pytest.mark.asyncio
+    async def test_failing_subscriber_is_removed(self):
+        """Test a subscriber that raises is dropped and the others stay subscribed."""
+        broadcaster = ProgressBroadcaster()
+        received = []
+        
+        async def failing(progress):
+            raise RuntimeError("subscriber failed")
+        
+        broadcaster.subscribe_to_task("task-1", failing)
+        broadcaster.subscribe_to_task("task-1", received.append)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        await broadcaster.broadcast_progress(make_update("task-1", 2))
+        
+        assert [progress.current for progress in received] == [1, 2]
+        assert broadcaster.get_connection_stats()['task_subscribers'] == {"task-1": 1}
+    
+    @pytest.mark.asyncio
+    async def test_bound_method_subscriber_is_held_weakly(self):
+        """Test a bound-method subscription doesn't keep its object alive."""
+        broadcaster = ProgressBroadcaster()
+        subscriber = Subscriber()
+        broadcaster.subscribe_to_task("task-1", subscriber.on_progress)
+        
+        await broadcaster.broadcast_progress(make_update("task-1", 1))
+        assert len(subscriber.updates) == 1
+        
+        del subscriber
+        gc.collect()
+        await broadcaster.broadcast_progress(make_update("task-1", 2))
+        
+        assert broadcaster.get_connection_stats()['task_subscribers'] == {}
+    
+    def test_subscriber_counts_follow_subscriptions(self):
+        """Test connection stats count each task's subscribers once."""
+        broadcaster = ProgressBroadcaster()
+        first, second = [], []
+        
+        broadcaster.subscribe_to_task("task-1", first.append)
+        broadcaster.subscribe_to_task("task-1", first.append)
+        broadcaster.subscribe_to_task("task-1", second.append)
+        broadcaster.subscribe_to_task("task-2", second.append)
+        assert broadcaster.get_connection_stats()['task_subscribers'] == {
+            "task-1": 2, "task-2": 1
+        }
+        
+        broadcaster.unsubscribe_from_task("task-2", second.append)
+        assert broadcaster.get_connection_stats()['task_subscribers'] == {"task-1": 2}
+
+
+class TestProgressHistory:
+    """Test the per-task progress history."""
+    
+    @pytest.mark.asyncio
+    async def test_history_keeps_most_recent_updates(self):
+        """Test history is capped, dropping the oldest updates first."""
+        broadcaster = ProgressBroadcaster()
+        
+        for current in range(broadcaster._max_history_size + 20):
+            await broadcaster.broadcast_progress(make_update("task-1", current, 1000))
+        
+        history = broadcaster.get_task_progress_history("task-1")
+        assert len(history) == broadcaster._max_history_size
+        assert history[0].current == 20
+        assert broadcaster.get_latest_progress("task-1") is history[-1]
+
+
+class TestTaskProgressCoalescing:
+    """Test TaskProgressTracker coalesces rapid updates before broadcasting."""
+    
+    @pytest.mark.asyncio
+    async def test_small_steps_are_coalesced_to_latest(self):
+        """Test sub-threshold updates inside the interval are held back, then the latest is sent."""
+        broadcaster = ProgressBroadcaster()
+        tracker = TaskProgressTracker("task-1", broadcaster)
+        
+        first = await tracker.update_progress(1, 1000)
+        held = [await tracker.update_progress(current, 1000) for current in range(2, 6)]
+        
+        assert isinstance(first, ProgressUpdate)
+        assert [progress.current for progress in held] == [2, 3, 4, 5]
+        assert [p.current for p in broadcaster.get_task_progress_history("task-1")] == [1]
+        
+        await asyncio.sleep(TaskProgressTracker.BROADCAST_INTERVAL_SECONDS * 2)
+        
+        assert [p.current for p in broadcaster.get_task_progress_history("task-1")] == [1, 5]
+    
+    @pytest.mark.asyncio
+    async def test_completion_is_broadcast_immediately(self):
+        """Test the final update supersedes a held-back one and goes out at once."""
+        broadcaster = ProgressBroadcaster()
+        tracker = TaskProgressTracker("task-1", broadcaster)
+        
+        await tracker.update_progress(1, 1000)
+        await tracker.update_progress(2, 1000)
+        await tracker.update_progress(1000, 1000)
+        await asyncio.sleep(TaskProgressTracker.BROADCAST_INTERVAL_SECONDS * 2)
+        
+        assert [p.current for p in broadcaster.get_task_progress_history("task-1")] == [1, 1000]
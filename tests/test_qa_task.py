@@ -0,0 +1,63 @@
+"""
+QA Task Tests
+
+Tests for the progress tracker QA tasks report through.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from qa_framework.base import (
+    ProgressStage,
+    ProgressTracker,
+    QAExecution,
+    QATaskType,
+    TaskConfig,
+)
+
+
+def make_tracker() -> ProgressTracker:
+    """Build a progress tracker for a fresh execution."""
+    config = TaskConfig(
+        task_id="task-1",
+        task_type=QATaskType.FIND_REPLACE,
+        course_id="course-1",
+        user_id="user-1",
+        canvas_instance_url="https://canvas.test.edu"
+    )
+    return ProgressTracker("task-1", QAExecution(task_id="task-1", config=config))
+
+
+class TestProgressExtras:
+    """Test extra progress fields passed to update_progress."""
+    
+    @pytest.mark.asyncio
+    async def test_known_fields_are_validated_and_serialized(self):
+        """Test extras are coerced like constructor arguments and kept on the stored update."""
+        tracker = make_tracker()
+        
+        progress = await tracker.update_progress(
+            ProgressStage.PROCESSING, 3, 10, "Scanning", items_processed="3", api_calls_made=7
+        )
+        
+        assert progress.items_processed == 3
+        assert progress.model_dump()["api_calls_made"] == 7
+        assert tracker.execution.progress_updates[-1] is progress
+    
+    @pytest.mark.asyncio
+    async def test_invalid_value_raises(self):
+        """Test an extra that fails its field's validation raises."""
+        tracker = make_tracker()
+        
+        with pytest.raises(ValidationError):
+            await tracker.update_progress(
+                ProgressStage.PROCESSING, 3, 10, items_processed="several"
+            )
+    
+    @pytest.mark.asyncio
+    async def test_unknown_field_raises(self):
+        """Test an extra that isn't a ProgressUpdate field raises rather than being dropped."""
+        tracker = make_tracker()
+        
+        with pytest.raises(ValueError):
+            await tracker.update_progress(ProgressStage.PROCESSING, 3, 10, foo="bar")
@@ -0,0 +1,83 @@
+"""
+QA Task Registry Tests
+
+Tests for task registration, version handling and validation in the QA
+framework's task registry.
+"""
+
+from typing import Any, Dict
+
+from qa_framework.base import QATask, QATaskRegistry, QATaskType, TaskInfo, ValidationResult
+
+
+class SampleTask(QATask):
+    """Minimal QA task for registry tests."""
+    
+    async def execute(self, config, progress_tracker, canvas_context=None, lti_context=None):
+        raise NotImplementedError
+    
+    def get_task_info(self) -> TaskInfo:
+        return TaskInfo(
+            name="sample_task",
+            description="Sample task",
+            version="1.0.0",
+            task_type=QATaskType.FIND_REPLACE
+        )
+    
+    def validate_config(self, config) -> ValidationResult:
+        return ValidationResult(is_valid=True)
+    
+    def get_config_schema(self) -> Dict[str, Any]:
+        return {}
+
+
+class TestTaskValidation:
+    """Test validate_task results."""
+    
+    def test_results_are_not_shared_between_calls(self):
+        """Test mutating a returned ValidationResult doesn't change later results."""
+        registry = QATaskRegistry()
+        assert registry.register_task(SampleTask)
+        
+        first = registry.validate_task("sample_task")
+        assert first.is_valid
+        first.add_error("caller-side error")
+        
+        second = registry.validate_task("sample_task")
+        assert second.is_valid
+        assert second.errors == []
+        assert second is not first
+
+
+class TestTaskVersions:
+    """Test version comparison when a task is registered again."""
+    
+    def test_newer_version_wins_with_numeric_comparison(self):
+        """Test 1.10.0 replaces 1.9.0 (a string comparison would keep 1.9.0)."""
+        registry = QATaskRegistry()
+        
+        assert registry.register_task(SampleTask, version="1.9.0")
+        assert registry.register_task(SampleTask, version="1.10.0")
+        
+        assert registry.get_task_metadata("sample_task")["version"] == "1.10.0"
+    
+    def test_older_version_is_rejected(self):
+        """Test 1.9.0 doesn't replace an already registered 1.10.0."""
+        registry = QATaskRegistry()
+        
+        assert registry.register_task(SampleTask, version="1.10.0")
+        assert not registry.register_task(SampleTask, version="1.9.0")
+        
+        assert registry.get_task_metadata("sample_task")["version"] == "1.10.0"
+    
+    def test_invalid_version_is_rejected(self):
+        """Test an invalid version string fails registration instead of raising."""
+        registry = QATaskRegistry()
+        
+        assert not registry.register_task(SampleTask, version="not-a-version")
+        assert "sample_task" not in registry.list_tasks()
+        
+        # An invalid version can't replace a valid one either
+        assert registry.register_task(SampleTask, version="1.0.0")
+        assert not registry.register_task(SampleTask, version="latest")
+        assert registry.get_task_metadata("sample_task")["version"] == "1.0.0"